@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from .config import SHEETS_TOKEN_CACHE_PATH, SHEETS_TOKEN_REFRESH_MARGIN_SEC
+
+
+class TokenProvider:
+    """Service-account credentials whose access token is cached and refreshed early.
+
+    The token and its expiry are kept on the credentials object and in a
+    0600 JSON file under /tmp, so warm invocations and helper scripts reuse a
+    token instead of minting a new one each run. A daemon thread refreshes
+    it `refresh_margin` seconds before expiry; `credentials()` also refreshes
+    synchronously if the thread hasn't had the chance (e.g. a frozen Lambda).
+    """
+
+    def __init__(
+        self,
+        creds_path: str,
+        scopes,
+        cache_path: str = SHEETS_TOKEN_CACHE_PATH,
+        refresh_margin: int = SHEETS_TOKEN_REFRESH_MARGIN_SEC,
+    ):
+        self.creds_path = creds_path
+        self.scopes = list(scopes)
+        self.cache_path = cache_path
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self.refreshes = 0
+        self._creds = None
+        self._saved_token = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load_credentials(self):
+        from google.oauth2.service_account import Credentials
+
+        return Credentials.from_service_account_file(self.creds_path, scopes=self.scopes)
+
+    def _cache_key(self) -> str:
+        return f"{getattr(self._creds, 'service_account_email', '')}|{' '.join(sorted(self.scopes))}"
+
+    def _load_cached_token(self) -> None:
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+            if cached.get("key") != self._cache_key():
+                return
+            # google-auth keeps expiry as a naive UTC datetime
+            self._creds.token = cached["token"]
+            self._creds.expiry = datetime.fromisoformat(cached["expiry"])
+            self._saved_token = cached["token"]
+        except (OSError, ValueError, KeyError):
+            return
+
+    def _save_token(self) -> None:
+        if not self._creds.token or self._creds.token == self._saved_token or self._creds.expiry is None:
+            return
+        state = {"key": self._cache_key(), "token": self._creds.token, "expiry": self._creds.expiry.isoformat()}
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            # The file holds a bearer token: owner read/write only
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.cache_path)
+            self._saved_token = self._creds.token
+        except OSError as e:
+            print(f"[warn] Could not cache Sheets access token: {e}")
+
+    def _needs_refresh(self) -> bool:
+        expiry = self._creds.expiry
+        return not self._creds.token or expiry is None or datetime.utcnow() >= expiry - self.refresh_margin
+
+    def refresh(self) -> None:
+        from google.auth.transport.requests import Request
+
+        with self._lock:
+            self._creds.refresh(Request())
+            self.refreshes += 1
+            self._save_token()
+
+    def credentials(self):
+        with self._lock:
+            if self._creds is None:
+                self._creds = self._load_credentials()
+                self._load_cached_token()
+            needs_refresh = self._needs_refresh()
+        if needs_refresh:
+            self.refresh()
+        else:
+            with self._lock:
+                # google-auth may have refreshed on its own mid-request; keep the file current
+                self._save_token()
+        return self._creds
+
+    def start(self) -> "TokenProvider":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sheets-token-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                expiry = self._creds.expiry if self._creds is not None else None
+            if expiry is None:
+                time.sleep(60)
+                continue
+            wait = (expiry - self.refresh_margin - datetime.utcnow()).total_seconds()
+            if wait > 0:
+                time.sleep(min(wait, 600))
+                continue
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[warn] Background Sheets token refresh failed: {e}")
+                time.sleep(60)
+
+
+_providers: Dict[str, TokenProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_token_provider(creds_path: str, scopes) -> TokenProvider:
+    """One provider per key file, shared by every Sheets service in the process."""
+    with _providers_lock:
+        provider = _providers.get(creds_path)
+        if provider is None:
+            provider = TokenProvider(creds_path, scopes).start()
+            _providers[creds_path] = provider
+        return provider
@@ -0,0 +1,154 @@
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from .config import CONFIG_RANGE, MEMBER_HISTORY_RANGE, TRACKING_RANGE, load_config
+from .sheets import (
+    MemberHistory,
+    TrackingSnapshot,
+    _batch_get_values,
+    _normalize_email,
+    _parse_config,
+    _parse_date,
+    _parse_history,
+    _as_text,
+    _retry_call,
+    current_week_start,
+    ensure_tabs,
+    rebuild_pending,
+)
+
+TRACKING_HEADER = [
+    "Email", "Team", "Date_Selected", "Form_Completed", "Reminders_Sent",
+    "Date_Completed", "DM_Channel", "Message_TS", "Scheduled_Reminders",
+]
+HISTORY_HEADER = ["Email", "Last_Selected", "Times_Selected", "Times_Completed", "Completion_Rate"]
+
+
+def semester_tab(day: date) -> str:
+    # Spring Jan-Apr, Summer May-Aug, Fall Sep-Dec
+    season = "Spring" if day.month <= 4 else "Summer" if day.month <= 8 else "Fall"
+    return f"Archive_{day.year}_{season}"
+
+
+@dataclass
+class CompactionPlan:
+    keep: List[List[Any]]
+    archive: Dict[str, List[List[Any]]] = field(default_factory=dict)
+    history: Dict[str, MemberHistory] = field(default_factory=dict)
+    folded: int = 0
+
+
+def plan_compaction(rows: List[List[Any]], history: Dict[str, MemberHistory], cutoff: date) -> CompactionPlan:
+    """Split Tracking rows into those kept and those archived, folding the latter into history.
+
+    A row is folded only if it is newer than the member's last_selected in
+    the history, so re-running after a partial failure never counts it twice.
+    """
+    plan = CompactionPlan(keep=[], history={email: replace(h) for email, h in history.items()})
+    folded_before = {email: h.last_selected for email, h in history.items()}
+    for row in rows:
+        selected = _parse_date(row[2]) if len(row) > 2 else None
+        # Undated rows and everything inside the cooldown window stay in Tracking
+        if selected is None or selected >= cutoff:
+            plan.keep.append(row)
+            continue
+        plan.archive.setdefault(semester_tab(selected), []).append(row)
+
+        email = _normalize_email(row[0])
+        last_folded = folded_before.get(email)
+        if last_folded is not None and selected <= last_folded:
+            continue
+        entry = plan.history.setdefault(email, MemberHistory(email))
+        entry.times_selected += 1
+        if len(row) > 3 and str(row[3]).strip().upper() == "TRUE":
+            entry.times_completed += 1
+        if entry.last_selected is None or selected > entry.last_selected:
+            entry.last_selected = selected
+        plan.folded += 1
+    return plan
+
+
+def _as_written(row: List[Any]) -> List[Any]:
+    # Rows come back as formatted values, so the "'" that kept G (channel) and H (message ts)
+    # as text is gone; put it back before USER_ENTERED turns the ts into a lossy number
+    cells = [str(c) for c in row] + [""] * (9 - len(row))
+    cells[6], cells[7] = _as_text(cells[6]), _as_text(cells[7])
+    return cells
+
+
+def _row_key(row: List[Any]) -> str:
+    return f"{_normalize_email(row[0])}|{str(row[2]).strip()}"
+
+
+def _write_values(service, spreadsheet_id: str, rng: str, values: List[List[Any]]) -> None:
+    _retry_call(
+        service.spreadsheets().values().update,
+        write=True,
+        spreadsheetId=spreadsheet_id,
+        range=rng,
+        valueInputOption="USER_ENTERED",
+        body={"values": values},
+    )
+
+
+def _clear(service, spreadsheet_id: str, rng: str) -> None:
+    _retry_call(service.spreadsheets().values().clear, write=True, spreadsheetId=spreadsheet_id, range=rng, body={})
+
+
+def compact_tracking(
+    service, spreadsheet_id: str, cooldown_weeks: Optional[int] = None, dry_run: bool = False
+) -> CompactionPlan:
+    """Move Tracking rows older than the cooldown window to per-semester archive tabs.
+
+    `cooldown_weeks` defaults to the Config tab's value, else BotConfig's.
+
+    Steps run in an order that is safe to repeat: archive rows are appended
+    only if not already there, history folds only rows it hasn't seen, and
+    tabs are overwritten before their leftover tails are cleared. Schedule it
+    when no selection or reminder run is writing (e.g. Sunday night).
+    """
+    tracking_values, history_values, config_values = _batch_get_values(
+        service, spreadsheet_id, [TRACKING_RANGE, MEMBER_HISTORY_RANGE, CONFIG_RANGE]
+    )
+    if cooldown_weeks is None:
+        cooldown_weeks = load_config().with_sheet_config(_parse_config(config_values)).cooldown_weeks
+    rows = tracking_values[1:] if tracking_values else []
+    cutoff = current_week_start() - timedelta(weeks=cooldown_weeks)
+    plan = plan_compaction(rows, _parse_history(history_values), cutoff)
+    if dry_run or not plan.archive:
+        return plan
+
+    missing = ensure_tabs(service, spreadsheet_id, list(plan.archive) + ["MemberHistory"])
+
+    # 1. Archive: append only rows the tab doesn't already hold
+    for tab, archived in plan.archive.items():
+        existing = [] if tab in missing else _batch_get_values(service, spreadsheet_id, [f"{tab}!A:I"])[0]
+        seen = {_row_key(r) for r in existing[1:] if len(r) > 2}
+        new_rows = [_as_written(r) for r in archived if _row_key(r) not in seen]
+        if not existing:
+            new_rows = [TRACKING_HEADER] + new_rows
+        if new_rows:
+            _retry_call(
+                service.spreadsheets().values().append,
+                write=True,
+                spreadsheetId=spreadsheet_id,
+                range=f"{tab}!A:I",
+                valueInputOption="USER_ENTERED",
+                insertDataOption="INSERT_ROWS",
+                body={"values": new_rows},
+            )
+
+    # 2. MemberHistory, rewritten whole (one row per member); it only ever grows
+    history_rows = [h.to_row() for _email, h in sorted(plan.history.items())]
+    _write_values(service, spreadsheet_id, "MemberHistory!A1", [HISTORY_HEADER] + history_rows)
+    _clear(service, spreadsheet_id, f"MemberHistory!A{len(history_rows) + 2}:E")
+
+    # 3. Tracking: overwrite from row 2 with the kept rows, then clear what is left below
+    if plan.keep:
+        _write_values(service, spreadsheet_id, "Tracking!A2", [_as_written(r) for r in plan.keep])
+    _clear(service, spreadsheet_id, f"Tracking!A{len(plan.keep) + 2}:I{len(rows) + 1}")
+
+    # 4. Kept rows moved up, so the Pending tab's Tracking references are rebuilt
+    rebuild_pending(service, spreadsheet_id, TrackingSnapshot(plan.keep))
+    return plan
@@ -0,0 +1,225 @@
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from slack_sdk.errors import SlackApiError
+
+from .config import load_config
+from .sheets import (
+    TrackingBatch,
+    TrackingSnapshot,
+    connect_to_sheets,
+    current_week_start,
+    load_tracking_snapshot,
+)
+from .slack import delete_scheduled_message, get_reactions, get_slack_client
+
+# Base names for 👍; skin tones arrive as e.g. "+1::skin-tone-3"
+THUMBS_UP = {"+1", "thumbsup"}
+
+# Tracking columns holding the DM location recorded at send time
+CHANNEL_COL = 6
+TS_COL = 7
+# chat.scheduleMessage IDs for reminders queued at selection time, one slot per
+# reminder: "first,final", with an empty slot where that reminder wasn't queued
+SCHEDULED_COL = 8
+REMINDER_SLOTS = 2
+
+
+def completion_key(email: str, week_start: Optional[date] = None) -> str:
+    """Identifies a Tracking row independent of its row number: "email|YYYY-MM-DD"."""
+    week_start = week_start or current_week_start()
+    return f"{email.strip().lower()}|{week_start.strftime('%Y-%m-%d')}"
+
+
+def parse_completion_key(key: str) -> Tuple[str, date]:
+    email, _, week = key.partition("|")
+    return email, datetime.strptime(week, "%Y-%m-%d").date()
+
+
+def scheduled_reminder_slots(row: List[str]) -> List[str]:
+    """Scheduled message ID per reminder slot (first, final), "" where none is queued."""
+    cell = str(row[SCHEDULED_COL]) if len(row) > SCHEDULED_COL else ""
+    slots = [sid.strip() for sid in cell.split(",")][:REMINDER_SLOTS]
+    return slots + [""] * (REMINDER_SLOTS - len(slots))
+
+
+def scheduled_reminder_ids(row: List[str]) -> List[str]:
+    return [sid for sid in scheduled_reminder_slots(row) if sid]
+
+
+def cancel_scheduled_reminders(
+    client, snapshot: TrackingSnapshot, batch: TrackingBatch, email: str, week_start: Optional[date] = None
+) -> int:
+    """Delete any reminders still queued for this row and clear them from Tracking."""
+    row_num = snapshot.find_row(email, week_start or current_week_start())
+    if row_num is None:
+        return 0
+    row = snapshot.row(row_num)
+    ids = scheduled_reminder_ids(row)
+    if not ids:
+        return 0
+    channel = row[CHANNEL_COL].strip() if len(row) > CHANNEL_COL else ""
+    cancelled = sum(1 for sid in ids if delete_scheduled_message(client, channel, sid))
+    batch.clear_scheduled(email, week_start)
+    return cancelled
+
+
+def is_thumbs_up(reaction: str) -> bool:
+    return reaction.split("::", 1)[0] in THUMBS_UP
+
+
+def check_reaction_completions(client, service, spreadsheet_id: str, snapshot: TrackingSnapshot) -> int:
+    """Mark this week's pending rows completed when their feedback DM has a 👍.
+
+    Makes one reactions.get per pending row that has a recorded channel/ts;
+    completed rows and rows logged before channel/ts were stored cost nothing.
+    """
+    completed = 0
+    with TrackingBatch(service, spreadsheet_id, snapshot) as batch:
+        for row_num in snapshot.pending_rows():
+            row = snapshot.row(row_num)
+            channel = row[CHANNEL_COL].strip() if len(row) > CHANNEL_COL else ""
+            ts = row[TS_COL].strip() if len(row) > TS_COL else ""
+            if not channel or not ts:
+                continue
+            try:
+                reactions = get_reactions(client, channel, ts)
+            except SlackApiError as e:
+                print(f"[fail] Could not read reactions for {row[0]}: {e}")
+                continue
+            if any(is_thumbs_up(r.get("name", "")) for r in reactions):
+                batch.mark_completed(row[0])
+                cancel_scheduled_reminders(client, snapshot, batch, row[0])
+                completed += 1
+                print(f"[ok] {row[0]} reacted 👍, marked completed")
+    return completed
+
+
+class CompletionTracker:
+    """Marks completion as soon as someone 👍s their feedback DM.
+
+    Holds an in-memory map of (channel, ts) -> email for this week's pending
+    feedback DMs, so reaction events on anything else are dropped with a
+    single dict lookup. Completions are queued and written in micro-batches
+    by a background thread: one Tracking read and one batchUpdate per flush.
+    The same thread reloads the map every `refresh_interval` seconds to pick
+    up DMs sent by the scheduled selection job.
+    """
+
+    def __init__(
+        self,
+        service,
+        spreadsheet_id: str,
+        client=None,
+        flush_interval: float = 5.0,
+        max_batch: int = 50,
+        refresh_interval: float = 300.0,
+    ):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        # Used to cancel pre-scheduled reminders; without it only Tracking is updated
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.refresh_interval = refresh_interval
+        # (channel, ts) -> (email, week start) of the Tracking row it belongs to
+        self.messages: Dict[Tuple[str, str], Tuple[str, date]] = {}
+        self.queue: List[Tuple[str, Optional[date]]] = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.refreshed_at = 0.0
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> "CompletionTracker":
+        self.refresh()
+        self.thread = threading.Thread(target=self._run, name="completion-tracker", daemon=True)
+        self.thread.start()
+        return self
+
+    def refresh(self, snapshot: Optional[TrackingSnapshot] = None) -> None:
+        if snapshot is None:
+            snapshot = load_tracking_snapshot(self.service, self.spreadsheet_id)
+        week_start = current_week_start()
+        messages: Dict[Tuple[str, str], Tuple[str, date]] = {}
+        for row_num in snapshot.pending_rows(week_start):
+            row = snapshot.row(row_num)
+            if len(row) > TS_COL and row[CHANNEL_COL] and row[TS_COL]:
+                messages[(row[CHANNEL_COL].strip(), row[TS_COL].strip())] = (row[0].strip(), week_start)
+        with self.lock:
+            self.messages = messages
+        self.refreshed_at = time.monotonic()
+
+    def track(self, channel: str, ts: str, email: str, week_start: Optional[date] = None) -> None:
+        with self.lock:
+            self.messages[(channel, ts)] = (email, week_start or current_week_start())
+
+    def forget(self, channel: str, ts: str) -> None:
+        with self.lock:
+            self.messages.pop((channel, ts), None)
+
+    def is_tracked(self, channel: str, ts: str) -> bool:
+        return (channel, ts) in self.messages
+
+    def handle_reaction(self, reaction: str, channel: str, ts: str) -> bool:
+        """Queue a completion if this is a 👍 on a tracked feedback DM; returns True if it was."""
+        if (channel, ts) not in self.messages or not is_thumbs_up(reaction):
+            return False
+        with self.lock:
+            entry = self.messages.pop((channel, ts), None)
+        if entry is None:
+            return False
+        self.submit(*entry)
+        return True
+
+    def submit(self, email: str, week_start: Optional[date] = None) -> None:
+        with self.lock:
+            self.queue.append((email, week_start))
+            full = len(self.queue) >= self.max_batch
+        if full:
+            self.wake.set()
+
+    def flush(self) -> int:
+        with self.lock:
+            entries, self.queue = self.queue, []
+        if not entries:
+            return 0
+        try:
+            snapshot = load_tracking_snapshot(self.service, self.spreadsheet_id)
+            with TrackingBatch(self.service, self.spreadsheet_id, snapshot) as batch:
+                for email, week_start in entries:
+                    batch.mark_completed(email, week_start)
+                    if self.client is not None:
+                        cancel_scheduled_reminders(self.client, snapshot, batch, email, week_start)
+        except Exception as e:
+            print(f"[error] Completion flush failed, will retry: {e}")
+            with self.lock:
+                self.queue = entries + self.queue
+            return 0
+        print(f"[ok] Marked {len(entries)} completed: {', '.join(e for e, _w in entries)}")
+        return len(entries)
+
+    def _run(self) -> None:
+        while True:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+            if time.monotonic() - self.refreshed_at >= self.refresh_interval:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"[error] Could not refresh tracked feedback DMs: {e}")
+
+
+def start_completion_tracker() -> Optional[CompletionTracker]:
+    """Start a tracker for the configured sheet, or return None if Sheets isn't set up."""
+    cfg = load_config()
+    if not cfg.google_sheets_id:
+        return None
+    try:
+        service = connect_to_sheets(cfg.google_creds_path)
+        return CompletionTracker(service, cfg.google_sheets_id, client=get_slack_client()).start()
+    except Exception as e:
+        print(f"[warn] Completion tracking disabled: {e}")
+        return None
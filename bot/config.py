@@ -1,5 +1,5 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Dict
 from dotenv import load_dotenv
 
@@ -8,25 +8,100 @@ load_dotenv()
 
 # Google Sheets ranges
 ROSTER_RANGE = "Roster!A:D"
-TRACKING_RANGE = "Tracking!A:F"
+TRACKING_RANGE = "Tracking!A:I"
 CONFIG_RANGE = "Config!A:B"
+# This week's selections; A-C/G-H/J are written once, D/E/F/I are formulas that
+# read the matching Tracking cells so reminder and completion writes show up here
+PENDING_RANGE = "Pending!A:J"
+# Per-member summary of Tracking rows folded away by compaction
+MEMBER_HISTORY_RANGE = "MemberHistory!A:E"
 
+# Weeks of Tracking rows that compaction keeps before archiving older ones.
+# Selection itself has no cooldown: each team rotates least-recently-selected first
 DEFAULT_COOLDOWN_WEEKS = 4
+# Config tab keys overriding picks per team, e.g. "team_count.software" or "team_count.default"
+TEAM_COUNT_PREFIX = "team_count."
+
+# Sheets API per-user quotas (requests per minute); raise these if the
+# project has been granted more
+SHEETS_READS_PER_MINUTE = int(os.getenv("SHEETS_READS_PER_MINUTE", "60"))
+SHEETS_WRITES_PER_MINUTE = int(os.getenv("SHEETS_WRITES_PER_MINUTE", "60"))
+
+# Optional pinned copy of the Sheets v4 discovery document; by default the copy
+# bundled with google-api-python-client is used, so no build() goes to the network
+SHEETS_DISCOVERY_PATH = os.getenv("SHEETS_DISCOVERY_PATH", "")
+
+# Local SQLite mirror of Roster/Tracking/Config; empty disables it and every
+# read goes to Sheets. Tracking rows from the last STORE_RESYNC_WEEKS weeks are
+# re-read on each sync since they can still change; older rows are settled.
+SHEET_STORE_PATH = os.getenv("SHEET_STORE_PATH", "")
+STORE_RESYNC_WEEKS = int(os.getenv("STORE_RESYNC_WEEKS", "2"))
+ROSTER_SYNC_TTL_SEC = int(os.getenv("ROSTER_SYNC_TTL_SEC", "3600"))
+
+# Service-account access token cache, shared by every Sheets entry point; tokens
+# are refreshed this many seconds before they expire
+SHEETS_TOKEN_CACHE_PATH = os.getenv("SHEETS_TOKEN_CACHE_PATH", "/tmp/sheets_token.json")
+SHEETS_TOKEN_REFRESH_MARGIN_SEC = int(os.getenv("SHEETS_TOKEN_REFRESH_MARGIN_SEC", "300"))
+
+# email -> Slack user ID cache; /tmp survives warm Lambda/Cloud Function invocations
+SLACK_DIRECTORY_PATH = os.getenv("SLACK_DIRECTORY_PATH", "/tmp/slack_directory.db")
+SLACK_DIRECTORY_TTL_SEC = int(os.getenv("SLACK_DIRECTORY_TTL_SEC", str(7 * 24 * 3600)))
+
+# When reminders are pre-scheduled at selection time: (weekday, hour, minute)
+# in REMINDER_TIMEZONE, Monday = 0. Matches the Wed 2pm / Fri 3pm cron runs.
+REMINDER_TIMEZONE = "America/New_York"
+FIRST_REMINDER_AT = (2, 14, 0)
+FINAL_REMINDER_AT = (4, 15, 0)
+
+# Per-run journals that let a timed-out invocation resume where it stopped
+RUN_JOURNAL_DIR = os.getenv("RUN_JOURNAL_DIR", "/tmp/run_journal")
+# Stop starting new work this many seconds before the platform timeout
+DEADLINE_RESERVE_SEC = int(os.getenv("DEADLINE_RESERVE_SEC", "10"))
+# Cloud Functions has no remaining-time API; matches the timeout in gcp/deploy_gcp.py
+FUNCTION_TIMEOUT_SEC = int(os.getenv("FUNCTION_TIMEOUT_SEC", "60"))
 
 @dataclass
 class BotConfig:
     slack_bot_token: str
     google_sheets_id: str
     google_creds_path: str
+    # Compaction window only (see DEFAULT_COOLDOWN_WEEKS); not read by selection
     cooldown_weeks: int
     form_url: str
     team_counts: Dict[str, int]
+    schedule_reminders: bool = False
+    fan_out_workers: int = 0
+
+    def with_sheet_config(self, values: Dict[str, str]) -> "BotConfig":
+        """A copy with the Config tab's known keys applied: `cooldown_weeks` and `team_count.<team>`.
+
+        Values that aren't whole numbers, and unknown keys, are skipped with a warning.
+        """
+        cooldown_weeks = self.cooldown_weeks
+        team_counts = dict(self.team_counts)
+        for key, value in values.items():
+            name = key.strip().lower()
+            if name != "cooldown_weeks" and not name.startswith(TEAM_COUNT_PREFIX):
+                print(f"[warn] Ignoring unknown Config key {key!r}")
+                continue
+            if not value.strip().isdigit():
+                print(f"[warn] Ignoring Config {key!r}: {value!r} is not a whole number")
+                continue
+            if name == "cooldown_weeks":
+                cooldown_weeks = int(value)
+            else:
+                team_counts[name[len(TEAM_COUNT_PREFIX):]] = int(value)
+        return replace(self, cooldown_weeks=cooldown_weeks, team_counts=team_counts)
 
 
 def load_config() -> BotConfig:
     slack_bot_token = os.getenv("SLACK_BOT_TOKEN", "")
     google_sheets_id = os.getenv("GOOGLE_SHEETS_ID", "")
     google_creds_path = os.getenv("GOOGLE_CREDS_PATH", "credentials.json")
+    # Queue both reminders with chat.scheduleMessage right after the initial DM
+    schedule_reminders = os.getenv("SCHEDULE_REMINDERS", "").lower() in ("1", "true", "yes")
+    # Send each team's selections from its own worker thread; 0 keeps one sequential pass
+    fan_out_workers = int(os.getenv("FAN_OUT_WORKERS", "0"))
 
     # Defaults per spec
     cooldown_weeks = DEFAULT_COOLDOWN_WEEKS
@@ -44,4 +119,6 @@ def load_config() -> BotConfig:
         cooldown_weeks=cooldown_weeks,
         form_url=form_url,
         team_counts=team_counts,
+        schedule_reminders=schedule_reminders,
+        fan_out_workers=fan_out_workers,
     )
@@ -0,0 +1,107 @@
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .config import SLACK_DIRECTORY_PATH, SLACK_DIRECTORY_TTL_SEC
+
+NORTHEASTERN_DOMAIN = "@northeastern.edu"
+HUSKY_DOMAIN = "@husky.neu.edu"
+
+
+def canonical_email(email: str) -> str:
+    # husky.neu.edu and northeastern.edu are the same mailbox; key both on the latter
+    email = email.strip().lower()
+    if email.endswith(HUSKY_DOMAIN):
+        return email[: -len(HUSKY_DOMAIN)] + NORTHEASTERN_DOMAIN
+    return email
+
+
+def email_variants(email: str) -> List[str]:
+    """The email as given, followed by its husky/northeastern alias if it has one."""
+    email = email.strip()
+    lower = email.lower()
+    if lower.endswith(NORTHEASTERN_DOMAIN):
+        return [email, lower[: -len(NORTHEASTERN_DOMAIN)] + HUSKY_DOMAIN]
+    if lower.endswith(HUSKY_DOMAIN):
+        return [email, lower[: -len(HUSKY_DOMAIN)] + NORTHEASTERN_DOMAIN]
+    return [email]
+
+
+class UserDirectory:
+    """Canonical email -> Slack user ID, kept in memory and persisted to SQLite.
+
+    Entries older than `ttl_seconds` are treated as misses so renamed or
+    deactivated accounts get re-resolved eventually. If the database can't
+    be opened the directory still works, just without persistence.
+    """
+
+    def __init__(self, path: str = SLACK_DIRECTORY_PATH, ttl_seconds: int = SLACK_DIRECTORY_TTL_SEC):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.entries: Dict[str, Tuple[str, float]] = {}
+        self.persistent = True
+        try:
+            with sqlite3.connect(self.path) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS directory ("
+                    "email TEXT PRIMARY KEY, user_id TEXT NOT NULL, fetched_at REAL NOT NULL)"
+                )
+                cutoff = time.time() - self.ttl_seconds
+                for email, user_id, fetched_at in conn.execute(
+                    "SELECT email, user_id, fetched_at FROM directory WHERE fetched_at >= ?",
+                    (cutoff,),
+                ):
+                    self.entries[email] = (user_id, fetched_at)
+        except sqlite3.Error as e:
+            print(f"[warn] Slack directory cache unavailable at {self.path}: {e}")
+            self.persistent = False
+
+    def get(self, email: str) -> Optional[str]:
+        entry = self.entries.get(canonical_email(email))
+        if entry is None:
+            return None
+        user_id, fetched_at = entry
+        if time.time() - fetched_at > self.ttl_seconds:
+            return None
+        return user_id
+
+    def put_many(self, mapping: Dict[str, str]) -> None:
+        now = time.time()
+        rows = [(canonical_email(email), user_id, now) for email, user_id in mapping.items() if user_id]
+        for email, user_id, fetched_at in rows:
+            self.entries[email] = (user_id, fetched_at)
+        if not rows or not self.persistent:
+            return
+        try:
+            with sqlite3.connect(self.path) as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO directory (email, user_id, fetched_at) VALUES (?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            print(f"[warn] Could not persist Slack directory entries: {e}")
+
+    def put(self, email: str, user_id: str) -> None:
+        self.put_many({email: user_id})
+
+    def forget(self, email: str) -> None:
+        key = canonical_email(email)
+        self.entries.pop(key, None)
+        if not self.persistent:
+            return
+        try:
+            with sqlite3.connect(self.path) as conn:
+                conn.execute("DELETE FROM directory WHERE email = ?", (key,))
+        except sqlite3.Error as e:
+            print(f"[warn] Could not drop Slack directory entry: {e}")
+
+
+_directory: Optional[UserDirectory] = None
+
+
+def get_directory() -> UserDirectory:
+    """Process-wide directory, loaded from disk on first use."""
+    global _directory
+    if _directory is None:
+        _directory = UserDirectory()
+    return _directory
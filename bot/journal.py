@@ -0,0 +1,103 @@
+import json
+import os
+import time
+from typing import List, Optional, Set, Tuple
+
+from .config import DEADLINE_RESERVE_SEC, RUN_JOURNAL_DIR
+from .selection import Person
+from .sheets import current_week_start
+
+
+def default_run_id(action: str) -> str:
+    # One run per action per week, so a retry of the same job resumes the same journal
+    return f"{action}-{current_week_start().isoformat()}"
+
+
+class RunJournal:
+    """Which (run_id, email, action) steps a run has finished, saved as JSON.
+
+    A run that is stopped before its deadline saves the journal; the next
+    invocation with the same run_id loads it, reuses the stored selections and
+    skips every step already recorded, so nobody is selected or DMed twice.
+    """
+
+    def __init__(self, run_id: str, directory: str = RUN_JOURNAL_DIR):
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"{run_id}.json")
+        self.done: Set[Tuple[str, str, str]] = set()
+        self.selections: Optional[List[Person]] = None
+        self.finished = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.done = {(self.run_id, email, action) for email, action in state.get("done", [])}
+        if state.get("selections") is not None:
+            self.selections = [(name, email) for name, email in state["selections"]]
+        self.finished = bool(state.get("finished"))
+
+    def child(self, name: str) -> "RunJournal":
+        """A separate journal for one partition of this run, e.g. one team in a fan-out."""
+        return RunJournal(f"{self.run_id}.{name}", directory=os.path.dirname(self.path))
+
+    def key(self, email: str, action: str) -> Tuple[str, str, str]:
+        return (self.run_id, email.strip().lower(), action)
+
+    def is_done(self, email: str, action: str) -> bool:
+        return self.key(email, action) in self.done
+
+    def record(self, email: str, action: str) -> None:
+        self.done.add(self.key(email, action))
+
+    def remember_selections(self, selections: List[Person]) -> None:
+        self.selections = list(selections)
+
+    def finish(self) -> None:
+        self.finished = True
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        state = {
+            "run_id": self.run_id,
+            "done": sorted([email, action] for _run_id, email, action in self.done),
+            "selections": self.selections,
+            "finished": self.finished,
+        }
+        # Write then rename, so a kill mid-write never leaves a truncated journal
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+class Deadline:
+    """Tells long loops when to checkpoint before the platform kills the invocation.
+
+    Pass a Lambda `context` to use `get_remaining_time_in_millis()`, or a
+    `budget_sec` measured from now where no such API exists (Cloud Functions).
+    """
+
+    def __init__(self, context=None, budget_sec: Optional[float] = None, reserve_sec: float = DEADLINE_RESERVE_SEC):
+        self.context = context
+        self.reserve_ms = reserve_sec * 1000
+        self.expires_at = time.monotonic() + budget_sec if budget_sec else None
+
+    def remaining_ms(self) -> Optional[float]:
+        if self.context is not None and hasattr(self.context, "get_remaining_time_in_millis"):
+            return self.context.get_remaining_time_in_millis()
+        if self.expires_at is not None:
+            return (self.expires_at - time.monotonic()) * 1000
+        return None
+
+    def near(self) -> bool:
+        remaining = self.remaining_ms()
+        return remaining is not None and remaining < self.reserve_ms
+
+    def allows(self, seconds: float) -> bool:
+        """True if `seconds` more work still ends before the reserve (always, without a limit)."""
+        remaining = self.remaining_ms()
+        return remaining is None or remaining - self.reserve_ms >= seconds * 1000
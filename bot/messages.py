@@ -1,13 +1,20 @@
+from typing import List
+
 from .config import load_config
 
 INITIAL_TEMPLATE = (
     "Hey {name}! You were randomly selected from the Community team to share quick feedback this week.\n"
     "It takes less than 30 seconds. Please fill this by Friday 5pm:\n\n"
     "{form_url}\n\n"
-    "React with 👍 to this message after you're done so the bot can check you off. If you don't do it, I will track you down! 😤\n\n"
+    "Tap *Submitted* below (or react with 👍) after you're done so the bot can check you off. If you don't do it, I will track you down! 😤\n\n"
     "You won't be selected again until your whole team has done it. Thanks!"
 )
 
+# action_id of the "Submitted" button on the initial DM
+SUBMITTED_ACTION_ID = "feedback_submitted"
+
+SUBMITTED_CONFIRMATION = "✅ Thanks! You're checked off for this week."
+
 FIRST_REMINDER_TEMPLATE = (
     "Friendly reminder for {team} feedback — could you fill this by Friday 5pm?\n{form_url}"
 )
@@ -30,3 +37,30 @@ def render_first_reminder(team: str) -> str:
 def render_final_reminder(team: str) -> str:
     cfg = load_config()
     return FINAL_REMINDER_TEMPLATE.format(team=team.capitalize(), form_url=cfg.form_url)
+
+
+def render_initial_blocks(name: str, team: str, completion_key: str) -> List[dict]:
+    # Same text as render_initial plus a "Submitted" button whose value is the Tracking row key
+    return [
+        {"type": "section", "text": {"type": "mrkdwn", "text": render_initial(name, team)}},
+        {
+            "type": "actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "action_id": SUBMITTED_ACTION_ID,
+                    "text": {"type": "plain_text", "text": "Submitted", "emoji": True},
+                    "style": "primary",
+                    "value": completion_key,
+                }
+            ],
+        },
+    ]
+
+
+def render_submitted_blocks(original_text: str) -> List[dict]:
+    # Replaces the button once it's been clicked
+    return [
+        {"type": "section", "text": {"type": "mrkdwn", "text": original_text}},
+        {"type": "context", "elements": [{"type": "mrkdwn", "text": SUBMITTED_CONFIRMATION}]},
+    ]
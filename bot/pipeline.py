@@ -0,0 +1,354 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+from .completion import completion_key, scheduled_reminder_slots
+from .config import FINAL_REMINDER_AT, FIRST_REMINDER_AT, REMINDER_TIMEZONE
+from .journal import Deadline, RunJournal
+from .messages import render_final_reminder, render_first_reminder, render_initial, render_initial_blocks
+from .roster import Roster
+from .selection import Person, run_full_selection
+from .sheets import (
+    SelectionLogger,
+    SheetData,
+    TrackingBatch,
+    TrackingSnapshot,
+    connect_to_sheets,
+    current_week_start,
+    get_pending_responses,
+)
+from .slack import SLACK_METHOD_RATES, batch_lookup_users, forget_stale_user, schedule_many, send_many
+
+Pending = Tuple[str, str, int]  # (email, team, reminders_sent)
+
+# DMs sent between deadline checks; each chunk is journaled and logged before the next
+CHECKPOINT_CHUNK = 25
+# With pre-scheduled reminders each DM adds two chat.scheduleMessage calls (50/min),
+# so deadline-bound runs use smaller chunks to keep each one well inside the budget
+SCHEDULED_CHUNK = 5
+
+# chat.scheduleMessage rejects post_at values in the past or too close to now
+MIN_SCHEDULE_LEAD_SEC = 60
+
+
+def reminder_slot_times() -> List[int]:
+    """Epoch times of this week's first and final reminder slots."""
+    import pytz  # only needed when reminders are pre-scheduled
+
+    tz = pytz.timezone(REMINDER_TIMEZONE)
+    week_start = current_week_start()
+    times = []
+    for weekday, hour, minute in (FIRST_REMINDER_AT, FINAL_REMINDER_AT):
+        day = week_start + timedelta(days=weekday)
+        local = tz.localize(datetime(day.year, day.month, day.day, hour, minute))
+        times.append(int(local.timestamp()))
+    return times
+
+
+def reminder_post_times(now: Optional[float] = None) -> List[Optional[int]]:
+    """Epoch times for this week's first and final reminders, None once a slot has passed."""
+    now = time.time() if now is None else now
+    return [post_at if post_at > now + MIN_SCHEDULE_LEAD_SEC else None for post_at in reminder_slot_times()]
+
+
+def _scheduling_seconds(calls: int) -> float:
+    # Worst case at the chat.scheduleMessage rate, ignoring the bucket's small burst
+    return calls * 60.0 / SLACK_METHOD_RATES["chat.scheduleMessage"]
+
+
+def _schedule_reminders(client, outgoing, results, workers: int) -> List[str]:
+    """Queue both reminders in each delivered DM's channel; returns "first,final" IDs per DM.
+
+    A slot stays empty when its time has passed or scheduling failed, so the
+    matching remind/final run still sends that reminder.
+    """
+    first_at, final_at = reminder_post_times()
+    items, owners = [], []
+    for i, ((_name, _email, team, _user_id), result) in enumerate(zip(outgoing, results)):
+        if not result.ok:
+            continue
+        if first_at:
+            items.append((result.channel, render_first_reminder(team), first_at))
+            owners.append((i, 0))
+        if final_at:
+            items.append((result.channel, render_final_reminder(team), final_at))
+            owners.append((i, 1))
+
+    scheduled = [["", ""] for _ in outgoing]
+    for (owner, slot), scheduled_id in zip(owners, schedule_many(client, items, workers=workers)):
+        scheduled[owner][slot] = scheduled_id or ""
+    return [",".join(slots) if any(slots) else "" for slots in scheduled]
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def plan_selection(data: SheetData, journal: Optional[RunJournal] = None) -> List[Person]:
+    """This week's selections, reusing a resumed run's picks and skipping anyone already logged."""
+    week_start = current_week_start()
+    if journal is not None and journal.selections is not None:
+        selections = journal.selections
+    else:
+        # Without a journal (e.g. a retry on a fresh instance), rows already logged
+        # this week come from an earlier, interrupted run; pick only each team's remainder
+        logged = data.tracking.table.team_counts_in_week(week_start)
+        selections = run_full_selection(
+            data.roster, data.last_selected(), logged=logged, team_counts=data.config.team_counts
+        )
+        if journal is not None:
+            journal.remember_selections(selections)
+            journal.save()
+    # Tracking is the durable record of who was already DMed
+    return [(name, email) for name, email in selections if data.tracking.find_row(email, week_start) is None]
+
+
+def send_selection_dms(
+    client,
+    service,
+    spreadsheet_id: str,
+    roster: Union[Roster, List[List[str]]],
+    selections: List[Person],
+    workers: int = 4,
+    schedule_reminders: bool = False,
+    journal: Optional[RunJournal] = None,
+    deadline: Optional[Deadline] = None,
+) -> int:
+    """Resolve, DM and log everyone selected this week; returns the number of DMs sent.
+
+    With a journal and deadline, DMs go out in chunks; each chunk is journaled
+    and logged to Tracking, and the loop stops early when the deadline is near.
+    `journal.finished` tells the caller whether everyone was handled.
+    """
+    if journal is not None:
+        selections = [(name, email) for name, email in selections if not journal.is_done(email, "dm")]
+    roster = Roster.of(roster)
+    user_ids = batch_lookup_users(client, [email for _name, email in selections])
+
+    outgoing = []
+    for name, email in selections:
+        user_id = user_ids.get(email)
+        if not user_id:
+            print(f"[skip] No Slack user for {email}")
+            continue
+        outgoing.append((name, email, roster.team_for(email), user_id))
+
+    sent = 0
+    stopped = False
+    # Rows are appended in bulk when the block exits, even if logging one raises
+    with SelectionLogger(service, spreadsheet_id) as tracking_log:
+        chunk_size = SCHEDULED_CHUNK if schedule_reminders and deadline is not None else CHECKPOINT_CHUNK
+        for chunk in _chunks(outgoing, chunk_size):
+            if deadline is not None and deadline.near():
+                print(f"[checkpoint] Deadline near, {len(outgoing) - sent} DMs left for the next run")
+                stopped = True
+                break
+            # Text stays as the notification fallback; the blocks add the "Submitted" button
+            messages = [
+                (user_id, render_initial(name=name, team=team), render_initial_blocks(name, team, completion_key(email)))
+                for name, email, team, user_id in chunk
+            ]
+            results = send_many(client, messages, workers=workers)
+
+            if journal is not None:
+                # Journal right after sending, before scheduling or the Tracking append,
+                # so a kill during either can't cause a second DM on retry
+                for (_name, email, _team, _user_id), result in zip(chunk, results):
+                    if result.ok:
+                        journal.record(email, "dm")
+                journal.save()
+
+            # With pre-scheduled reminders the Wed/Fri cron runs have nothing left to send
+            scheduled = [""] * len(chunk)
+            if schedule_reminders:
+                if deadline is None or deadline.allows(_scheduling_seconds(2 * len(chunk))):
+                    scheduled = _schedule_reminders(client, chunk, results, workers)
+                else:
+                    # Log the chunk unscheduled (the remind/final runs will cover it) and stop here
+                    print("[checkpoint] No time left to pre-schedule reminders for this chunk")
+                    stopped = True
+
+            for (name, email, team, _user_id), result, scheduled_ids in zip(chunk, results, scheduled):
+                if result.ok:
+                    tracking_log.add(email, name, team, result.channel, result.ts, scheduled_ids)
+                    sent += 1
+                    print(f"[ok] DM sent to {name} <{email}>")
+                else:
+                    print(f"[fail] DM failed for {name} <{email}>: {result.error}")
+                    # The next lookup goes back to users.list instead of a dead cached ID
+                    forget_stale_user(email, result)
+            if deadline is not None:
+                tracking_log.flush()
+            if stopped:
+                break
+
+    if journal is not None and not stopped:
+        journal.finish()
+        journal.save()
+    return sent
+
+
+def partition_by_team(roster: Union[Roster, List[List[str]]], selections: List[Person]) -> Dict[str, List[Person]]:
+    return Roster.of(roster).partition(selections)
+
+
+def fan_out_selection_dms(
+    client,
+    creds_path: str,
+    spreadsheet_id: str,
+    roster: Union[Roster, List[List[str]]],
+    selections: List[Person],
+    team_workers: int = 4,
+    workers: int = 2,
+    schedule_reminders: bool = False,
+    journal: Optional[RunJournal] = None,
+    deadline: Optional[Deadline] = None,
+) -> int:
+    """Send each team's selections from its own worker thread; returns the total DMs sent.
+
+    Every worker does lookup, DM and logging for one team, with its own
+    Sheets service (googleapiclient services are not thread-safe) and its
+    own child journal. The chat.postMessage bucket is shared, so the
+    combined send rate stays within Slack's limit.
+    """
+    # Indexed once here rather than once per worker
+    roster = Roster.of(roster)
+    partitions = roster.partition(selections)
+    if not partitions:
+        if journal is not None:
+            journal.finish()
+            journal.save()
+        return 0
+    # One users.list sweep up front, so the workers' lookups are directory hits
+    batch_lookup_users(client, [email for _name, email in selections])
+    team_journals = {team: journal.child(team or "unassigned") for team in partitions} if journal is not None else {}
+
+    def run_team(team: str) -> int:
+        return send_selection_dms(
+            client,
+            connect_to_sheets(creds_path),
+            spreadsheet_id,
+            roster,
+            partitions[team],
+            workers=workers,
+            schedule_reminders=schedule_reminders,
+            journal=team_journals.get(team),
+            deadline=deadline,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, min(team_workers, len(partitions)))) as pool:
+        sent = sum(pool.map(run_team, list(partitions)))
+
+    if journal is not None and all(j.finished for j in team_journals.values()):
+        journal.finish()
+        journal.save()
+    return sent
+
+
+def pending_reminders(
+    service, spreadsheet_id: str, snapshot: TrackingSnapshot, now: Optional[float] = None
+) -> List[Pending]:
+    """This week's non-responders with the number of reminders they have actually received.
+
+    Slack delivers pre-scheduled reminders without touching Reminders_Sent
+    (E), so a filled slot whose post time has passed counts as sent, and E is
+    brought up to date for those rows.
+    """
+    pending = get_pending_responses(service, spreadsheet_id, snapshot=snapshot)
+    week_start = current_week_start()
+    slots = {}
+    for email, _team, _count in pending:
+        row_num = snapshot.find_row(email, week_start)
+        if row_num is not None:
+            slots[email] = scheduled_reminder_slots(snapshot.row(row_num))
+    if not any(any(ids) for ids in slots.values()):
+        return pending
+
+    now = time.time() if now is None else now
+    times = reminder_slot_times()
+    reconciled = []
+    with TrackingBatch(service, spreadsheet_id, snapshot) as batch:
+        for email, team, count in pending:
+            ids = slots.get(email, ["", ""])
+            delivered = max((i + 1 for i, sid in enumerate(ids) if sid and times[i] <= now), default=0)
+            if delivered > count:
+                batch.set_reminders(email, delivered)
+                count = delivered
+            reconciled.append((email, team, count))
+    return reconciled
+
+
+def send_reminder_dms(
+    client,
+    service,
+    spreadsheet_id: str,
+    snapshot: TrackingSnapshot,
+    pending: List[Pending],
+    workers: int = 4,
+    journal: Optional[RunJournal] = None,
+    deadline: Optional[Deadline] = None,
+) -> int:
+    """Send the first or final reminder to each pending person based on their count."""
+    week_start = current_week_start()
+    queued = []
+    for email, team, count in pending:
+        row_num = snapshot.find_row(email, week_start)
+        # count 0 is due the first reminder and 1 the final; skip only if that one is queued
+        if row_num is not None and count < 2 and scheduled_reminder_slots(snapshot.row(row_num))[count]:
+            print(f"[skip] Reminder {count + 1} already scheduled for {email}")
+            continue
+        if journal is not None and journal.is_done(email, f"reminder{count + 1}"):
+            continue
+        queued.append((email, team, count))
+
+    user_ids = batch_lookup_users(client, [email for email, _team, _count in queued])
+
+    outgoing = []
+    for email, team, count in queued:
+        user_id = user_ids.get(email)
+        if not user_id:
+            print(f"[skip] No Slack user for {email}")
+            continue
+        if count == 0:
+            msg = render_first_reminder(team)
+        elif count == 1:
+            msg = render_final_reminder(team)
+        else:
+            print(f"[skip] Already sent two reminders to {email}")
+            continue
+        outgoing.append((email, count, user_id, msg))
+
+    sent = 0
+    stopped = False
+    # Reminder counts are written in one batchUpdate per chunk, and when the block exits
+    with TrackingBatch(service, spreadsheet_id, snapshot) as batch:
+        for chunk in _chunks(outgoing, CHECKPOINT_CHUNK):
+            if deadline is not None and deadline.near():
+                print(f"[checkpoint] Deadline near, {len(outgoing) - sent} reminders left for the next run")
+                stopped = True
+                break
+            results = send_many(client, [(user_id, msg) for _email, _count, user_id, msg in chunk], workers=workers)
+
+            if journal is not None:
+                for (email, count, _user_id, _msg), result in zip(chunk, results):
+                    if result.ok:
+                        journal.record(email, f"reminder{count + 1}")
+                journal.save()
+
+            for (email, count, _user_id, _msg), result in zip(chunk, results):
+                if result.ok:
+                    batch.increment_reminder(email)
+                    sent += 1
+                    print(f"[ok] Reminder {count+1} sent to <{email}>")
+                else:
+                    print(f"[fail] Reminder failed for <{email}>: {result.error}")
+                    forget_stale_user(email, result)
+            if deadline is not None:
+                batch.commit()
+
+    if journal is not None and not stopped:
+        journal.finish()
+        journal.save()
+    return sent
@@ -0,0 +1,79 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+Person = Tuple[str, str]  # (name, email)
+
+
+class Member:
+    """One roster row: A=name, B=email, C=team, D=status."""
+
+    __slots__ = ("name", "email", "team", "status", "key")
+
+    def __init__(self, name: str, email: str, team: str, status: str = "Active"):
+        self.name = name
+        self.email = email
+        self.team = team
+        self.status = status
+        # Normalized email, the lookup key everywhere else (Tracking, journal, directory)
+        self.key = email.strip().lower()
+
+    @property
+    def person(self) -> Person:
+        return (self.name, self.email)
+
+    def to_row(self) -> List[str]:
+        return [self.name, self.email, self.team, self.status]
+
+    def __repr__(self) -> str:
+        return f"Member({self.name!r}, {self.email!r}, {self.team!r}, {self.status!r})"
+
+
+class Roster:
+    """Active members, indexed once by normalized email and by team.
+
+    Lookups are O(1), so per-selection team lookups don't rescan the roster.
+    If an email appears twice, the first row wins, as with the old scans.
+    """
+
+    def __init__(self, members: Iterable[Member] = ()):
+        self.members: List[Member] = list(members)
+        self.by_email: Dict[str, Member] = {}
+        self.by_team: Dict[str, List[Member]] = {}
+        for member in self.members:
+            self.by_email.setdefault(member.key, member)
+            self.by_team.setdefault(member.team, []).append(member)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[List[str]]) -> "Roster":
+        return cls(Member(*row[:4]) for row in rows)
+
+    @classmethod
+    def of(cls, roster: Union["Roster", List[List[str]]]) -> "Roster":
+        """Accept either a Roster or the plain [name, email, team, status] rows."""
+        return roster if isinstance(roster, cls) else cls.from_rows(roster)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __iter__(self) -> Iterator[Member]:
+        return iter(self.members)
+
+    def get(self, email: str) -> Optional[Member]:
+        return self.by_email.get(email.strip().lower())
+
+    def team_for(self, email: str) -> str:
+        member = self.get(email)
+        return member.team if member is not None else ""
+
+    def teams(self) -> Dict[str, List[Person]]:
+        """Team -> (name, email) pairs, in roster order."""
+        return {team: [m.person for m in members] for team, members in self.by_team.items()}
+
+    def partition(self, selections: List[Person]) -> Dict[str, List[Person]]:
+        """Group selections by their roster team ("" for anyone not on the roster)."""
+        partitions: Dict[str, List[Person]] = {}
+        for name, email in selections:
+            partitions.setdefault(self.team_for(email), []).append((name, email))
+        return partitions
+
+    def rows(self) -> List[List[str]]:
+        return [m.to_row() for m in self.members]
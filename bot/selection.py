@@ -1,31 +1,25 @@
+import heapq
 import random
-from typing import Dict, List, Tuple
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple, Union
 
 from .config import load_config
+from .roster import Person, Roster
 
-Person = Tuple[str, str]  # (name, email)
+# (last selected date ordinal, tie-break, name, email); 0 = never selected
+_Entry = Tuple[int, float, str, str]
 
 
-def group_by_teams(roster: List[List[str]]) -> Dict[str, List[Person]]:
-    teams: Dict[str, List[Person]] = {}
-    for row in roster:
-        name, email, team, _status = row
-        teams.setdefault(team, []).append((name, email))
-    return teams
-
-
-def filter_eligible(team_members: List[Person], recent_emails: List[str]) -> List[Person]:
-    recent_set = set(e.lower() for e in recent_emails)
-    return [(n, e) for (n, e) in team_members if e.lower() not in recent_set]
-
-
-def _desired_picks_for_team(team_name: str, team_size: int) -> int:
-    cfg = load_config()
+def _desired_picks_for_team(team_name: str, team_size: int, team_counts: Optional[Dict[str, int]] = None) -> int:
+    if team_counts is None:
+        team_counts = load_config().team_counts
     team_lower = team_name.lower()
-    if team_lower in ("software", "data"):
-        desired = cfg.team_counts.get(team_lower, 3)
+    if team_lower in team_counts:
+        desired = team_counts[team_lower]
+    elif team_lower in ("software", "data"):
+        desired = 3
     else:
-        desired = cfg.team_counts.get("default", 1)
+        desired = team_counts.get("default", 1)
 
     # Edge-case override: tiny teams (<= 3) select 1; very big teams can be 2-3
     if team_size <= 3:
@@ -36,25 +30,78 @@ def _desired_picks_for_team(team_name: str, team_size: int) -> int:
     return desired
 
 
-def select_from_team(team_name: str, eligible_members: List[Person]) -> List[Person]:
-    if not eligible_members:
-        return []
-    count = _desired_picks_for_team(team_name, len(eligible_members))
-    count = min(count, len(eligible_members))
-    return random.sample(eligible_members, count)
+class TeamRotation:
+    """Least-recently-selected queue for one team, a heap keyed on last-selected date.
 
+    Never-selected members come first, in random order; picking moves people to
+    the back with the pick date. Nobody is picked twice until everyone else on
+    the team has been picked since, which is what the welcome DM promises.
+    """
 
-def run_full_selection(roster: List[List[str]], recent_emails: List[str]) -> List[Person]:
-    teams = group_by_teams(roster)
-    final: List[Person] = []
+    def __init__(
+        self,
+        team: str,
+        members: List[Person],
+        last_selected: Dict[str, int],
+        rng: Optional[random.Random] = None,
+    ):
+        self.team = team
+        self.rng = rng or random.Random()
+        self.heap: List[_Entry] = [
+            (last_selected.get(email.strip().lower(), 0), self.rng.random(), name, email) for name, email in members
+        ]
+        heapq.heapify(self.heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
 
-    for team_name, members in teams.items():
-        eligible = filter_eligible(members, recent_emails)
-        if not eligible:
-            # If we exhausted everyone recently, reset pool (edge case 4)
-            eligible = members
-        picks = select_from_team(team_name, eligible)
-        final.extend(picks)
+    def pick(self, count: int, on: Optional[date] = None) -> List[Person]:
+        """Take the `count` least recently selected members and requeue them as selected `on`."""
+        # UTC, like the Date_Selected written to Tracking
+        day = (on or datetime.utcnow().date()).toordinal()
+        picked = [heapq.heappop(self.heap) for _ in range(min(count, len(self.heap)))]
+        for _last, _tie, name, email in picked:
+            heapq.heappush(self.heap, (day, self.rng.random(), name, email))
+        return [(name, email) for _last, _tie, name, email in picked]
+
+
+def build_rotations(
+    roster: Union[Roster, List[List[str]]],
+    last_selected: Dict[str, int],
+    rng: Optional[random.Random] = None,
+) -> Dict[str, TeamRotation]:
+    """One rotation per roster team, seeded from each member's last selection date ordinal."""
+    rng = rng or random.Random()
+    return {
+        team: TeamRotation(team, members, last_selected, rng)
+        for team, members in Roster.of(roster).teams().items()
+    }
+
+
+def run_full_selection(
+    roster: Union[Roster, List[List[str]]],
+    last_selected: Dict[str, int],
+    rng: Optional[random.Random] = None,
+    rotations: Optional[Dict[str, TeamRotation]] = None,
+    on: Optional[date] = None,
+    logged: Optional[Dict[str, int]] = None,
+    team_counts: Optional[Dict[str, int]] = None,
+) -> List[Person]:
+    """This week's picks: the least recently selected members of every team.
+
+    `last_selected` maps normalized email -> date ordinal (see
+    SheetData.last_selected). Pass `rotations` to keep queues across weeks
+    instead of rebuilding them from the sheet. `logged` maps team -> members
+    already picked this week (an interrupted run), which come off that
+    team's count. `team_counts` defaults to BotConfig.team_counts.
+    """
+    if rotations is None:
+        rotations = build_rotations(roster, last_selected, rng)
+    logged = logged or {}
+    final: List[Person] = []
+    for team_name, rotation in rotations.items():
+        wanted = _desired_picks_for_team(team_name, len(rotation), team_counts) - logged.get(team_name.lower(), 0)
+        final.extend(rotation.pick(max(0, wanted), on))
 
     # Deduplicate in case of duplicates in roster
     seen = set()
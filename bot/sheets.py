@@ -1,49 +1,156 @@
+import json
+import threading
 import time
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from httplib2 import HttpLib2Error
 
-from .config import ROSTER_RANGE, TRACKING_RANGE
+from .config import (
+    CONFIG_RANGE,
+    MEMBER_HISTORY_RANGE,
+    PENDING_RANGE,
+    ROSTER_RANGE,
+    SHEETS_DISCOVERY_PATH,
+    SHEETS_READS_PER_MINUTE,
+    SHEETS_WRITES_PER_MINUTE,
+    TRACKING_RANGE,
+    BotConfig,
+    load_config,
+)
+from .auth import get_token_provider
+from .ratelimit import TokenBucket, backoff_delay
+from .roster import Roster
+from .tracking_table import TrackingTable, date_ordinal
 
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
 ]
 
 
+_discovery_document: Optional[Dict[str, Any]] = None
+
+
+def _sheets_discovery_document() -> Optional[Dict[str, Any]]:
+    """The Sheets v4 discovery document, read and parsed once per process.
+
+    Comes from SHEETS_DISCOVERY_PATH when set, otherwise from the copy bundled
+    with google-api-python-client. None means neither is available.
+    """
+    global _discovery_document
+    if _discovery_document is None:
+        if SHEETS_DISCOVERY_PATH:
+            with open(SHEETS_DISCOVERY_PATH) as f:
+                _discovery_document = json.load(f)
+        else:
+            from googleapiclient.discovery_cache import get_static_doc
+
+            doc = get_static_doc("sheets", "v4")
+            _discovery_document = json.loads(doc) if doc else None
+    return _discovery_document
+
+
 def connect_to_sheets(creds_path: str):
+    # googleapiclient.discovery and google.auth are the slowest imports in the
+    # package; load them only when a service is actually built
+    from googleapiclient.discovery import build, build_from_document
+
     try:
-        credentials = Credentials.from_service_account_file(creds_path, scopes=SCOPES)
-        service = build("sheets", "v4", credentials=credentials)
-        return service
+        # Shared provider: the access token is minted about once an hour, not per run
+        credentials = get_token_provider(creds_path, SCOPES).credentials()
+        document = _sheets_discovery_document()
+        if document is None:
+            # Older clients without bundled documents; still skip the on-disk file cache
+            return build("sheets", "v4", credentials=credentials, cache_discovery=False)
+        # Building from the parsed document skips both the fetch and the JSON parse
+        return build_from_document(document, credentials=credentials)
     except Exception as e:
         raise RuntimeError(f"Failed to authenticate with Google Sheets: {e}")
 
 
-def _retry_call(func, *args, retries: int = 3, delay_sec: float = 1.5, **kwargs):
-    last_err = None
-    for _ in range(retries):
+_service = None
+_service_creds_path = ""
+_service_lock = threading.Lock()
+
+
+def get_sheets_service(creds_path: str):
+    """Process-wide Sheets service, built on first use and reused across warm invocations.
+
+    googleapiclient services are not thread-safe; worker threads should call
+    `connect_to_sheets` for their own.
+    """
+    global _service, _service_creds_path
+    with _service_lock:
+        if _service is None or creds_path != _service_creds_path:
+            _service = connect_to_sheets(creds_path)
+            _service_creds_path = creds_path
+        return _service
+
+
+# Statuses worth retrying; anything else (400 bad range, 403 permissions, 404) fails fast
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+_read_bucket = TokenBucket(SHEETS_READS_PER_MINUTE)
+_write_bucket = TokenBucket(SHEETS_WRITES_PER_MINUTE)
+
+
+def _is_retryable(err: Exception) -> bool:
+    if isinstance(err, HttpError):
+        return err.resp.status in RETRYABLE_STATUSES
+    # Dropped connections and timeouts from the HTTP transport
+    return isinstance(err, (OSError, HttpLib2Error))
+
+
+def _retry_after(err: Exception) -> Optional[float]:
+    if isinstance(err, HttpError):
+        value = err.resp.get("retry-after")
+        if value and str(value).isdigit():
+            return float(value)
+    return None
+
+
+def _retry_call(func, *args, write: bool = False, retries: int = 5, **kwargs):
+    """Build and execute a Sheets request under the read/write quota buckets.
+
+    Retryable failures back off exponentially with jitter (or honor
+    Retry-After); everything else is raised immediately.
+    """
+    bucket = _write_bucket if write else _read_bucket
+    for attempt in range(retries):
+        bucket.acquire()
         try:
-            return func(*args, **kwargs)
-        except HttpError as e:
-            last_err = e
-            time.sleep(delay_sec)
+            return func(*args, **kwargs).execute()
         except Exception as e:
-            last_err = e
-            time.sleep(delay_sec)
-    if last_err:
-        raise last_err
+            if attempt == retries - 1 or not _is_retryable(e):
+                raise
+            if isinstance(e, HttpError) and e.resp.status == 429:
+                # The server says the window is spent; stop bursting from what's left
+                bucket.drain()
+            delay = _retry_after(e) or backoff_delay(attempt)
+            print(f"[retry] Sheets call failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
 
 
-def get_roster(service, spreadsheet_id: str) -> List[List[str]]:
+def ensure_tabs(service, spreadsheet_id: str, titles: List[str]) -> List[str]:
+    """Add any of `titles` the spreadsheet doesn't have yet; returns the ones added."""
     resp = _retry_call(
-        service.spreadsheets().values().get,
-        spreadsheetId=spreadsheet_id,
-        range=ROSTER_RANGE,
-    ).execute()
-    values = resp.get("values", [])
+        service.spreadsheets().get, spreadsheetId=spreadsheet_id, fields="sheets.properties.title"
+    )
+    existing = {s["properties"]["title"] for s in resp.get("sheets", [])}
+    missing = [t for t in titles if t not in existing]
+    if missing:
+        _retry_call(
+            service.spreadsheets().batchUpdate,
+            write=True,
+            spreadsheetId=spreadsheet_id,
+            body={"requests": [{"addSheet": {"properties": {"title": t}}} for t in missing]},
+        )
+    return missing
+
+
+def _parse_roster(values: List[List[str]]) -> List[List[str]]:
     if not values:
         return []
 
@@ -62,32 +169,57 @@ def get_roster(service, spreadsheet_id: str) -> List[List[str]]:
     return result
 
 
-def get_recent_selections(service, spreadsheet_id: str, weeks: int = 4) -> List[str]:
+def _parse_config(values: List[List[str]]) -> Dict[str, str]:
+    # A=key, B=value; header row skipped
+    config: Dict[str, str] = {}
+    for row in values[1:]:
+        if len(row) >= 2 and row[0].strip():
+            config[row[0].strip()] = row[1].strip()
+    return config
+
+
+@dataclass
+class MemberHistory:
+    """Everything compaction folded away for one member."""
+
+    email: str
+    last_selected: Optional[date] = None
+    times_selected: int = 0
+    times_completed: int = 0
+
+    @property
+    def completion_rate(self) -> float:
+        return self.times_completed / self.times_selected if self.times_selected else 0.0
+
+    def to_row(self) -> List[Any]:
+        last = self.last_selected.strftime("%Y-%m-%d") if self.last_selected else ""
+        return [self.email, last, self.times_selected, self.times_completed, f"{self.completion_rate:.2f}"]
+
+
+def _parse_history(values: List[List[str]]) -> Dict[str, MemberHistory]:
+    # A=email, B=last_selected, C=times_selected, D=times_completed (E=rate is derived); header skipped
+    history: Dict[str, MemberHistory] = {}
+    for row in values[1:]:
+        if not row or not row[0].strip():
+            continue
+        cells = row + [""] * (4 - len(row))
+        email = _normalize_email(cells[0])
+        history[email] = MemberHistory(
+            email=email,
+            last_selected=_parse_date(cells[1]),
+            times_selected=int(cells[2]) if cells[2].strip().isdigit() else 0,
+            times_completed=int(cells[3]) if cells[3].strip().isdigit() else 0,
+        )
+    return history
+
+
+def get_roster(service, spreadsheet_id: str) -> List[List[str]]:
     resp = _retry_call(
         service.spreadsheets().values().get,
         spreadsheetId=spreadsheet_id,
-        range=TRACKING_RANGE,
-    ).execute()
-    values = resp.get("values", [])
-    if not values:
-        return []
-    rows = values[1:]
-
-    cutoff_date = datetime.utcnow().date() - timedelta(weeks=weeks)
-    recent_emails: List[str] = []
-    for row in rows:
-        # A=email, B=team, C=date_selected
-        if len(row) < 3:
-            continue
-        email = row[0].strip()
-        date_str = row[2].strip()
-        try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d").date()
-            if dt >= cutoff_date:
-                recent_emails.append(email)
-        except Exception:
-            continue
-    return recent_emails
+        range=ROSTER_RANGE,
+    )
+    return _parse_roster(resp.get("values", []))
 
 
 def _week_start(date_obj) -> datetime:
@@ -95,128 +227,490 @@ def _week_start(date_obj) -> datetime:
     return date_obj - timedelta(days=date_obj.weekday())
 
 
-def get_pending_responses(service, spreadsheet_id: str) -> List[Tuple[str, str, int]]:
+def current_week_start() -> date:
+    return _week_start(datetime.utcnow().date())
+
+
+def _normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def _parse_date(date_str: str) -> Optional[date]:
+    # Parsed once per distinct string; see tracking_table.date_ordinal
+    ordinal = date_ordinal(date_str)
+    return date.fromordinal(ordinal) if ordinal else None
+
+
+class TrackingSnapshot:
+    """One read of the Tracking tab, with (normalized email, week start) -> sheet row lookups.
+
+    Load it once per run and pass it to the update helpers so they can locate
+    rows without another `values.get`. Writes made through those helpers are
+    mirrored into the snapshot, so it stays usable for the rest of the run.
+    """
+
+    def __init__(self, rows: List[List[str]], row_nums: Optional[List[int]] = None):
+        # rows excludes the header; rows[i] lives on sheet row i + 2 unless row_nums says otherwise
+        self.rows = rows
+        self.table = TrackingTable(rows, row_nums)
+        # Per-week email -> row lookups, built the first time a week is asked for
+        self._weeks: Dict[date, Dict[str, int]] = {}
+
+    def week_rows(self, week_start: date) -> Dict[str, int]:
+        """Normalized email -> sheet row for one week, from a single pass over the week column."""
+        rows = self._weeks.get(week_start)
+        if rows is None:
+            rows = self._weeks[week_start] = self.table.week_rows(week_start)
+        return rows
+
+    def _position(self, row_num: int) -> int:
+        return row_num - 2
+
+    def pending_rows(self, week_start: Optional[date] = None) -> List[int]:
+        """Sheet rows selected in the given week (default: this week) and not yet completed."""
+        if week_start is None:
+            week_start = current_week_start()
+        table = self.table
+        rows: List[int] = []
+        # Only the first row per person counts, and it needs reminders_sent (E)
+        for row_num in sorted(self.week_rows(week_start).values()):
+            pos = self._position(row_num)
+            if table.widths[pos] < 5 or table.completed[pos]:
+                continue
+            rows.append(row_num)
+        return rows
+
+    def find_row(self, email: str, week_start: date) -> Optional[int]:
+        return self.week_rows(week_start).get(_normalize_email(email))
+
+    def row(self, row_num: int) -> List[str]:
+        return self.rows[row_num - 2]
+
+    def set_cell(self, row_num: int, col: int, value: Any) -> None:
+        row = self.row(row_num)
+        while len(row) <= col:
+            row.append("")
+        row[col] = str(value)
+        self.table.refresh(self._position(row_num), row)
+
+
+class PendingSnapshot(TrackingSnapshot):
+    """This week's Tracking rows, keyed by their real Tracking row.
+
+    Built from the Pending tab or the local store's week index. Behaves like a
+    TrackingSnapshot for `pending_rows`, `find_row` and the TrackingBatch
+    writers, but holds only this week's selections.
+    """
+
+    def __init__(self, rows_by_num: Dict[int, List[str]]):
+        self.by_row = rows_by_num
+        row_nums = sorted(rows_by_num)
+        self.positions = {row_num: pos for pos, row_num in enumerate(row_nums)}
+        super().__init__([rows_by_num[n] for n in row_nums], row_nums)
+
+    def _position(self, row_num: int) -> int:
+        return self.positions[row_num]
+
+    def row(self, row_num: int) -> List[str]:
+        return self.by_row[row_num]
+
+
+def _pending_row(row_num: int, row: List[Any]) -> List[Any]:
+    # A-C and G-H never change after selection; D (completed), E (reminders), F (completed on)
+    # and I (scheduled IDs) follow Tracking through formulas; J is the Tracking row
+    cells = [str(c) for c in row] + [""] * (9 - len(row))
+    return [
+        cells[0], cells[1], cells[2],
+        f"=Tracking!D{row_num}", f"=Tracking!E{row_num}", f"=Tracking!F{row_num}",
+        _as_text(cells[6]), _as_text(cells[7]), f"=Tracking!I{row_num}",
+        row_num,
+    ]
+
+
+def _append_pending_rows(service, spreadsheet_id: str, first_row: int, rows: List[List[Any]]) -> None:
+    try:
+        _retry_call(
+            service.spreadsheets().values().append,
+            write=True,
+            spreadsheetId=spreadsheet_id,
+            range=PENDING_RANGE,
+            valueInputOption="USER_ENTERED",
+            insertDataOption="INSERT_ROWS",
+            body={"values": [_pending_row(first_row + i, row) for i, row in enumerate(rows)]},
+        )
+    except HttpError as e:
+        if e.resp.status != 400:
+            raise
+        # No Pending tab yet; reminder runs fall back to reading Tracking
+        print(f"[warn] Could not add rows to the Pending tab: {e}")
+
+
+def rebuild_pending(service, spreadsheet_id: str, snapshot: TrackingSnapshot) -> int:
+    """Rewrite the Pending tab from this week's rows of a Tracking snapshot.
+
+    Run at the start of each selection run (dropping last week's rows) and
+    after compaction renumbers Tracking. Returns the number of rows listed.
+    """
+    week_start = current_week_start()
+    row_nums = sorted(snapshot.week_rows(week_start).values())
+    ensure_tabs(service, spreadsheet_id, ["Pending"])
+    header = ["Email", "Team", "Date_Selected", "Form_Completed", "Reminders_Sent",
+              "Date_Completed", "DM_Channel", "Message_TS", "Scheduled_Reminders", "Tracking_Row"]
+    _retry_call(
+        service.spreadsheets().values().update,
+        write=True,
+        spreadsheetId=spreadsheet_id,
+        range="Pending!A1",
+        valueInputOption="USER_ENTERED",
+        body={"values": [header] + [_pending_row(n, snapshot.row(n)) for n in row_nums]},
+    )
+    _retry_call(
+        service.spreadsheets().values().clear,
+        write=True,
+        spreadsheetId=spreadsheet_id,
+        range=f"Pending!A{len(row_nums) + 2}:J",
+        body={},
+    )
+    return len(row_nums)
+
+
+def load_pending_snapshot(service, spreadsheet_id: str) -> Optional[PendingSnapshot]:
+    """This week's rows from the Pending tab, or None if there is no usable Pending tab."""
+    try:
+        resp = _retry_call(
+            service.spreadsheets().values().get,
+            spreadsheetId=spreadsheet_id,
+            range=PENDING_RANGE,
+        )
+    except HttpError as e:
+        if e.resp.status != 400:
+            raise
+        return None
+
+    week_start = current_week_start()
+    rows_by_num: Dict[int, List[str]] = {}
+    for row in resp.get("values", [])[1:]:
+        if len(row) < 10 or not str(row[9]).isdigit():
+            continue
+        dt = _parse_date(row[2])
+        if dt is not None and _week_start(dt) == week_start:
+            rows_by_num[int(row[9])] = list(row[:9])
+    # Nothing for this week: not built yet (or no selection ran), so let the caller read Tracking
+    return PendingSnapshot(rows_by_num) if rows_by_num else None
+
+
+def load_tracking_snapshot(service, spreadsheet_id: str) -> TrackingSnapshot:
     resp = _retry_call(
         service.spreadsheets().values().get,
         spreadsheetId=spreadsheet_id,
         range=TRACKING_RANGE,
-    ).execute()
+    )
     values = resp.get("values", [])
-    if not values:
-        return []
-    rows = values[1:]
+    return TrackingSnapshot(values[1:] if values else [])
 
-    today = datetime.utcnow().date()
-    start_of_week = _week_start(today)
 
-    pending: List[Tuple[str, str, int]] = []
-    for row in rows:
-        # A=email, B=team, C=date_selected, D=form_completed, E=reminders_sent
-        if len(row) < 5:
-            continue
-        email = row[0].strip()
-        team = row[1].strip().lower()
-        date_str = row[2].strip()
-        completed = row[3].strip().upper() == "TRUE"
-        reminders_sent = int(row[4]) if row[4].isdigit() else 0
+@dataclass
+class SheetData:
+    roster: Roster
+    tracking: TrackingSnapshot
+    # Environment defaults with the Config tab applied
+    config: BotConfig = field(default_factory=load_config)
+    # Older history compacted out of Tracking, by normalized email
+    history: Dict[str, MemberHistory] = field(default_factory=dict)
+    # Latest selection ordinal per email over all of Tracking, when `tracking`
+    # holds only this week's rows (see SheetStore.sheet_data)
+    latest: Optional[Dict[str, int]] = None
+
+    def last_selected(self) -> Dict[str, int]:
+        """Normalized email -> date ordinal of the latest selection, from MemberHistory and Tracking."""
+        latest = {email: h.last_selected.toordinal() for email, h in self.history.items() if h.last_selected}
+        tracked = self.latest if self.latest is not None else self.tracking.table.last_selected()
+        for email, ordinal in tracked.items():
+            if ordinal > latest.get(email, 0):
+                latest[email] = ordinal
+        return latest
+
+
+# Tabs a sheet may not have yet; a missing tab fails the whole batchGet with a 400
+OPTIONAL_RANGES = (CONFIG_RANGE, MEMBER_HISTORY_RANGE)
+
+
+def _fetch_ranges(service, spreadsheet_id: str, ranges: List[str]) -> List[List[List[str]]]:
+    resp = _retry_call(
+        service.spreadsheets().values().batchGet,
+        spreadsheetId=spreadsheet_id,
+        ranges=ranges,
+    )
+    # valueRanges come back in request order
+    values = [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+    return values + [[]] * (len(ranges) - len(values))
+
+
+def _batch_get_values(service, spreadsheet_id: str, ranges: List[str]) -> List[List[List[str]]]:
+    """One `values.batchGet`; values per range in request order, [] for missing optional tabs."""
+    try:
+        return _fetch_ranges(service, spreadsheet_id, ranges)
+    except HttpError as e:
+        optional = [r for r in ranges if r in OPTIONAL_RANGES]
+        if e.resp.status != 400 or not optional:
+            raise
+
+    # Fetch the required ranges together, then find out which optional tab is missing
+    required = [r for r in ranges if r not in OPTIONAL_RANGES]
+    found = dict(zip(required, _fetch_ranges(service, spreadsheet_id, required))) if required else {}
+    for rng in optional:
         try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d").date()
-            if _week_start(dt) == start_of_week and not completed:
-                pending.append((email, team, reminders_sent))
-        except Exception:
-            continue
+            found[rng] = _fetch_ranges(service, spreadsheet_id, [rng])[0]
+        except HttpError as e:
+            if e.resp.status != 400:
+                raise
+            found[rng] = []
+    return [found[r] for r in ranges]
+
+
+def load_sheet_data(service, spreadsheet_id: str) -> SheetData:
+    """Fetch Roster, Tracking, Config and MemberHistory in a single `values.batchGet`."""
+    roster_values, tracking_values, config_values, history_values = _batch_get_values(
+        service, spreadsheet_id, [ROSTER_RANGE, TRACKING_RANGE, CONFIG_RANGE, MEMBER_HISTORY_RANGE]
+    )
+    return SheetData(
+        roster=Roster.from_rows(_parse_roster(roster_values)),
+        tracking=TrackingSnapshot(tracking_values[1:] if tracking_values else []),
+        config=load_config().with_sheet_config(_parse_config(config_values)),
+        history=_parse_history(history_values),
+    )
+
+
+def get_pending_responses(
+    service, spreadsheet_id: str, snapshot: Optional[TrackingSnapshot] = None
+) -> List[Tuple[str, str, int]]:
+    if snapshot is None:
+        snapshot = load_tracking_snapshot(service, spreadsheet_id)
+
+    pending: List[Tuple[str, str, int]] = []
+    for row_num in snapshot.pending_rows():
+        row = snapshot.row(row_num)
+        reminders_sent = int(row[4]) if str(row[4]).isdigit() else 0
+        pending.append((row[0].strip(), row[1].strip().lower(), reminders_sent))
     return pending
 
 
-def log_selection(service, spreadsheet_id: str, email: str, name: str, team: str) -> None:
+def _as_text(value: str) -> str:
+    """Escape a cell written with USER_ENTERED so Sheets stores it as text.
+
+    Slack message timestamps such as "1760700000.123456" would otherwise be
+    parsed as numbers and lose digits, and the stored ts would no longer
+    match the message for reactions.get. Already-escaped values pass through.
+    """
+    if not value or value.startswith("'"):
+        return value
+    return f"'{value}"
+
+
+def _selection_row(
+    email: str, team: str, channel: str = "", ts: str = "", scheduled_ids: str = ""
+) -> List[Any]:
+    # G/H hold the DM channel and message ts (kept as text) so completion checks can go straight
+    # to the message; I holds "first,final" chat.scheduleMessage IDs when reminders were pre-scheduled
     today_str = datetime.utcnow().strftime("%Y-%m-%d")
-    new_row = [email, team, today_str, "FALSE", 0, ""]
-    _retry_call(
+    return [email, team, today_str, "FALSE", 0, "", channel, _as_text(ts), scheduled_ids]
+
+
+def _first_appended_row(resp: Dict[str, Any]) -> Optional[int]:
+    # updates.updatedRange looks like "Tracking!A120:I124"
+    updated = resp.get("updates", {}).get("updatedRange", "")
+    cells = updated.split("!")[-1].split(":")[0]
+    digits = "".join(ch for ch in cells if ch.isdigit())
+    return int(digits) if digits else None
+
+
+def _append_tracking_rows(service, spreadsheet_id: str, rows: List[List[Any]]) -> Dict[str, Any]:
+    return _retry_call(
         service.spreadsheets().values().append,
+        write=True,
         spreadsheetId=spreadsheet_id,
         range=TRACKING_RANGE,
         valueInputOption="USER_ENTERED",
         insertDataOption="INSERT_ROWS",
-        body={"values": [new_row]},
-    ).execute()
+        body={"values": rows},
+    )
 
 
-def update_reminder_count(service, spreadsheet_id: str, email: str) -> None:
-    # Read all rows to locate the row for this week and email, then update column E
-    resp = _retry_call(
-        service.spreadsheets().values().get,
-        spreadsheetId=spreadsheet_id,
-        range=TRACKING_RANGE,
-    ).execute()
-    values = resp.get("values", [])
-    if not values:
-        return
+def log_selection(
+    service, spreadsheet_id: str, email: str, name: str, team: str, channel: str = "", ts: str = ""
+) -> None:
+    _append_tracking_rows(service, spreadsheet_id, [_selection_row(email, team, channel, ts)])
 
-    rows = values[1:]
-    today = datetime.utcnow().date()
-    start_of_week = _week_start(today)
 
-    for idx, row in enumerate(rows, start=2):  # account for header row at line 1
-        if len(row) < 5:
-            continue
-        row_email = row[0].strip()
-        date_str = row[2].strip() if len(row) > 2 else ""
-        try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except Exception:
-            continue
-        if row_email == email and _week_start(dt) == start_of_week:
-            current = row[4]
-            count = int(current) if str(current).isdigit() else 0
-            count += 1
-            rng = f"Tracking!E{idx}:E{idx}"
-            _retry_call(
-                service.spreadsheets().values().update,
-                spreadsheetId=spreadsheet_id,
-                range=rng,
-                valueInputOption="USER_ENTERED",
-                body={"values": [[count]]},
-            ).execute()
+class SelectionLogger:
+    """Buffers Tracking rows for a selection run and appends them in bulk.
+
+    Use it as a context manager around the DM loop: rows are written in one
+    `values.append` per `chunk_size` selections, and whatever is buffered is
+    flushed on exit even if the loop raised, so no sent DM goes unlogged.
+    """
+
+    def __init__(self, service, spreadsheet_id: str, chunk_size: int = 500):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.chunk_size = chunk_size
+        self.buffer: List[List[Any]] = []
+        self.logged = 0
+
+    def add(
+        self, email: str, name: str, team: str, channel: str = "", ts: str = "", scheduled_ids: str = ""
+    ) -> None:
+        self.buffer.append(_selection_row(email, team, channel, ts, scheduled_ids))
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
             return
+        rows = self.buffer
+        resp = _append_tracking_rows(self.service, self.spreadsheet_id, rows)
+        # Only drop rows once the append succeeded, so a retry can pick them up
+        self.buffer = []
+        self.logged += len(rows)
+        first_row = _first_appended_row(resp or {})
+        if first_row is not None:
+            _append_pending_rows(self.service, self.spreadsheet_id, first_row, rows)
 
+    def __enter__(self) -> "SelectionLogger":
+        return self
 
-def mark_completed(service, spreadsheet_id: str, email: str) -> None:
-    # Find this week's row by email and set D=TRUE, F=today
-    resp = _retry_call(
-        service.spreadsheets().values().get,
-        spreadsheetId=spreadsheet_id,
-        range=TRACKING_RANGE,
-    ).execute()
-    values = resp.get("values", [])
-    if not values:
-        return
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        try:
+            self.flush()
+        except Exception as e:
+            if exc_type is None:
+                raise
+            # Don't mask the loop's own error, but make the unlogged rows visible
+            print(f"[error] Failed to log {len(self.buffer)} selections: {e}")
+            for row in self.buffer:
+                print(f"[unlogged] {row}")
+        return False
 
-    rows = values[1:]
-    today = datetime.utcnow().date()
-    start_of_week = _week_start(today)
-    today_str = today.strftime("%Y-%m-%d")
 
-    for idx, row in enumerate(rows, start=2):
-        if len(row) < 6:
-            continue
-        row_email = row[0].strip()
-        date_str = row[2].strip() if len(row) > 2 else ""
+class TrackingBatch:
+    """Collects reminder and completion writes and commits them in one `values.batchUpdate`.
+
+    Rows are located through the snapshot, which is also updated as writes are
+    queued. With `checkpoint_every` set, the batch commits on its own once that
+    many rows are dirty so a killed run loses at most one checkpoint of writes.
+    """
+
+    def __init__(
+        self,
+        service,
+        spreadsheet_id: str,
+        snapshot: TrackingSnapshot,
+        checkpoint_every: int = 100,
+    ):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.snapshot = snapshot
+        self.checkpoint_every = checkpoint_every
+        # range -> value; repeated writes to the same cell collapse into one
+        self.updates: Dict[str, Any] = {}
+        self.dirty_rows: set = set()
+        self.committed = 0
+
+    def _week_row(self, email: str, week_start: Optional[date] = None) -> Optional[int]:
+        return self.snapshot.find_row(email, week_start or current_week_start())
+
+    def _queue(self, row_num: int, col: int, value: Any) -> None:
+        letter = chr(ord("A") + col)
+        self.updates[f"Tracking!{letter}{row_num}:{letter}{row_num}"] = value
+        self.snapshot.set_cell(row_num, col, value)
+        self.dirty_rows.add(row_num)
+
+    def _maybe_checkpoint(self) -> None:
+        if self.checkpoint_every and len(self.dirty_rows) >= self.checkpoint_every:
+            self.commit()
+
+    def increment_reminder(self, email: str) -> bool:
+        idx = self._week_row(email)
+        if idx is None:
+            return False
+        row = self.snapshot.row(idx)
+        current = row[4] if len(row) > 4 else ""
+        count = int(current) if str(current).isdigit() else 0
+        self._queue(idx, 4, count + 1)
+        self._maybe_checkpoint()
+        return True
+
+    def set_reminders(self, email: str, count: int) -> bool:
+        idx = self._week_row(email)
+        if idx is None:
+            return False
+        self._queue(idx, 4, count)
+        self._maybe_checkpoint()
+        return True
+
+    def mark_completed(self, email: str, week_start: Optional[date] = None) -> bool:
+        # week_start defaults to this week; pass it when completing an older DM
+        idx = self._week_row(email, week_start)
+        if idx is None:
+            return False
+        today_str = datetime.utcnow().strftime("%Y-%m-%d")
+        self._queue(idx, 3, "TRUE")
+        self._queue(idx, 5, today_str)
+        self._maybe_checkpoint()
+        return True
+
+    def clear_scheduled(self, email: str, week_start: Optional[date] = None) -> bool:
+        idx = self._week_row(email, week_start)
+        if idx is None:
+            return False
+        self._queue(idx, 8, "")
+        self._maybe_checkpoint()
+        return True
+
+    def commit(self) -> int:
+        if not self.updates:
+            return 0
+        data = [{"range": rng, "values": [[value]]} for rng, value in self.updates.items()]
+        _retry_call(
+            self.service.spreadsheets().values().batchUpdate,
+            write=True,
+            spreadsheetId=self.spreadsheet_id,
+            body={"valueInputOption": "USER_ENTERED", "data": data},
+        )
+        committed = len(self.dirty_rows)
+        self.updates = {}
+        self.dirty_rows = set()
+        self.committed += committed
+        return committed
+
+    def __enter__(self) -> "TrackingBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
         try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except Exception:
-            continue
-        if row_email == email and _week_start(dt) == start_of_week:
-            rng_completed = f"Tracking!D{idx}:D{idx}"
-            rng_date = f"Tracking!F{idx}:F{idx}"
-            _retry_call(
-                service.spreadsheets().values().batchUpdate,
-                spreadsheetId=spreadsheet_id,
-                body={
-                    "valueInputOption": "USER_ENTERED",
-                    "data": [
-                        {"range": rng_completed, "values": [["TRUE"]]},
-                        {"range": rng_date, "values": [[today_str]]},
-                    ],
-                },
-            ).execute()
-            return
+            self.commit()
+        except Exception as e:
+            if exc_type is None:
+                raise
+            print(f"[error] Failed to commit {len(self.dirty_rows)} Tracking updates: {e}")
+        return False
+
+
+def update_reminder_count(
+    service, spreadsheet_id: str, email: str, snapshot: Optional[TrackingSnapshot] = None
+) -> None:
+    # Increment column E on this week's row for the email
+    if snapshot is None:
+        snapshot = load_tracking_snapshot(service, spreadsheet_id)
+    with TrackingBatch(service, spreadsheet_id, snapshot) as batch:
+        batch.increment_reminder(email)
+
+
+def mark_completed(
+    service, spreadsheet_id: str, email: str, snapshot: Optional[TrackingSnapshot] = None
+) -> None:
+    # Find this week's row by email and set D=TRUE, F=today
+    if snapshot is None:
+        snapshot = load_tracking_snapshot(service, spreadsheet_id)
+    with TrackingBatch(service, spreadsheet_id, snapshot) as batch:
+        batch.mark_completed(email)
@@ -0,0 +1,137 @@
+import csv
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from .roster import Member, Person, Roster
+from .selection import _desired_picks_for_team, build_rotations, run_full_selection
+from .sheets import current_week_start
+
+
+def team_sizes_from_csv(path: str) -> Dict[str, int]:
+    """Active members per team in a roster CSV (Name, Email, Team, Status), teams lowercased."""
+    sizes: Dict[str, int] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if (row.get("Status") or "").strip() != "Active":
+                continue
+            team = (row.get("Team") or "").strip().lower()
+            sizes[team] = sizes.get(team, 0) + 1
+    return sizes
+
+
+def scale_team_sizes(sizes: Dict[str, int], members: int) -> Dict[str, int]:
+    """Scale team sizes to `members` in total, keeping proportions (largest remainder) and >= 1 per team."""
+    total = sum(sizes.values())
+    shares = {team: size * members / total for team, size in sizes.items()}
+    scaled = {team: max(1, int(share)) for team, share in shares.items()}
+    by_remainder = sorted(shares, key=lambda team: shares[team] - int(shares[team]), reverse=True)
+    for team in by_remainder[: max(0, members - sum(scaled.values()))]:
+        scaled[team] += 1
+    return scaled
+
+
+def synthetic_roster(sizes: Dict[str, int], rng: random.Random) -> Roster:
+    """A roster with the given team sizes, listed in random order like a real signup sheet."""
+    teams = [team for team, size in sizes.items() for _ in range(size)]
+    rng.shuffle(teams)
+    return Roster(Member(f"Member {i}", f"member{i}@northeastern.edu", team) for i, team in enumerate(teams))
+
+
+@dataclass
+class WeekStats:
+    week: date
+    picks: int
+    seconds: float
+    # tracemalloc peak above the memory already held when the week started
+    peak_bytes: int = 0
+
+
+@dataclass
+class SimulationReport:
+    seed: int
+    members: int
+    teams: int
+    weeks: List[WeekStats] = field(default_factory=list)
+    selections: List[List[Person]] = field(default_factory=list)
+    # Longest stretch, in weeks, a member waited for a selection: between two
+    # picks, or still open at the end (since the last pick, or the start)
+    max_gap_weeks: int = 0
+    # What the rotation promises: ceil(team size / picks per week), over all teams
+    gap_bound_weeks: int = 0
+    selected_members: int = 0
+    # Building the queues before week one; without `rebuild` that cost isn't in any week
+    build_seconds: float = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.build_seconds + sum(w.seconds for w in self.weeks)
+
+    @property
+    def peak_bytes(self) -> int:
+        return max((w.peak_bytes for w in self.weeks), default=0)
+
+
+def simulate(
+    roster: Roster,
+    weeks: int,
+    seed: int = 0,
+    start: Optional[date] = None,
+    rebuild: bool = False,
+    trace_memory: bool = True,
+) -> SimulationReport:
+    """Run weekly selection `weeks` times in memory and measure each week.
+
+    By default the team rotations persist between weeks. With `rebuild` they
+    are rebuilt every week from the last-selected dates, as a scheduled run
+    rebuilds them from the sheet. The same seed and roster replay the same
+    picks.
+    """
+    rng = random.Random(seed)
+    start = start or current_week_start()
+    last_selected: Dict[str, int] = {}
+    last_week: Dict[str, int] = {}
+    began = time.perf_counter()
+    rotations = build_rotations(roster, last_selected, rng)
+    report = SimulationReport(
+        seed=seed, members=len(roster), teams=len(rotations), build_seconds=time.perf_counter() - began
+    )
+    for team, rotation in rotations.items():
+        per_week = min(_desired_picks_for_team(team, len(rotation)), len(rotation))
+        report.gap_bound_weeks = max(report.gap_bound_weeks, -(-len(rotation) // per_week))
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        for week_no in range(weeks):
+            day = start + timedelta(weeks=week_no)
+            if trace_memory:
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            began = time.perf_counter()
+            if rebuild:
+                rotations = build_rotations(roster, last_selected, rng)
+            picks = run_full_selection(roster, last_selected, rotations=rotations, on=day)
+            seconds = time.perf_counter() - began
+            peak = tracemalloc.get_traced_memory()[1] - baseline if trace_memory else 0
+
+            for _name, email in picks:
+                key = email.strip().lower()
+                if key in last_week:
+                    report.max_gap_weeks = max(report.max_gap_weeks, week_no - last_week[key])
+                last_week[key] = week_no
+                last_selected[key] = day.toordinal()
+            report.weeks.append(WeekStats(week=day, picks=len(picks), seconds=seconds, peak_bytes=peak))
+            report.selections.append(picks)
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    report.selected_members = len(last_week)
+    # Gaps still open when the run ends; never-selected members have waited since week 0
+    for member in roster:
+        waited = weeks - last_week.get(member.email.strip().lower(), 0)
+        report.max_gap_weeks = max(report.max_gap_weeks, waited)
+    return report
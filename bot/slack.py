@@ -1,82 +1,268 @@
 import time
 import ssl
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
 from .config import load_config
+from .ratelimit import TokenBucket
+from .directory import UserDirectory, canonical_email, email_variants, get_directory
+
+
+# Calls per minute for each Web API method we use, per Slack's rate limit tiers
+# (Tier 2 = 20, Tier 3 = 50). chat.postMessage is rated per channel (~1/s),
+# and every DM is its own channel, so it gets a higher workspace-wide budget.
+SLACK_METHOD_RATES = {
+    "chat.postMessage": 180,
+    "users.list": 20,
+    "users.lookupByEmail": 50,
+    "reactions.get": 50,
+    "chat.scheduleMessage": 50,
+    "chat.deleteScheduledMessage": 50,
+}
+DEFAULT_METHOD_RATE = 50
+
+_method_buckets: Dict[str, TokenBucket] = {}
+_method_buckets_lock = threading.Lock()
+
+
+def _bucket_for(method: str) -> TokenBucket:
+    with _method_buckets_lock:
+        bucket = _method_buckets.get(method)
+        if bucket is None:
+            rate = SLACK_METHOD_RATES.get(method, DEFAULT_METHOD_RATE)
+            # Allow a short burst rather than a full minute's worth at once
+            bucket = TokenBucket(rate, per=60.0, capacity=max(1, rate // 10))
+            _method_buckets[method] = bucket
+        return bucket
+
+
+def _call_slack(method: str, func, retries: int = 3, **kwargs):
+    """Call a Web API method under its rate bucket, honoring Retry-After on 429."""
+    bucket = _bucket_for(method)
+    for attempt in range(retries):
+        bucket.acquire()
+        try:
+            return func(**kwargs)
+        except SlackApiError as e:
+            if e.response.status_code != 429 or attempt == retries - 1:
+                raise
+            delay = float(e.response.headers.get("Retry-After", 1))
+            bucket.drain()
+            print(f"[retry] {method} rate limited; retrying in {delay:.0f}s")
+            time.sleep(delay)
+
+
+_client: Optional[WebClient] = None
+_client_token = ""
+_client_lock = threading.Lock()
+
+
+def _ssl_context() -> ssl.SSLContext:
+    # Verified TLS. Prefer certifi's CA bundle when it's installed: python.org
+    # macOS builds ship without system roots, which is what used to cause
+    # CERTIFICATE_VERIFY_FAILED locally.
+    try:
+        import certifi
+        return ssl.create_default_context(cafile=certifi.where())
+    except ImportError:
+        return ssl.create_default_context()
 
 
 def get_slack_client() -> WebClient:
-    cfg = load_config()
-    # Create SSL context that doesn't verify certificates (for development)
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
-    
-    return WebClient(token=cfg.slack_bot_token, ssl=ssl_context)
+    """Process-wide WebClient, reused across calls and warm Lambda/Cloud Function invocations.
+
+    A new client is only built on first use or when SLACK_BOT_TOKEN changes.
+    """
+    global _client, _client_token
+    token = load_config().slack_bot_token
+    with _client_lock:
+        if _client is None or token != _client_token:
+            _client = WebClient(token=token, ssl=_ssl_context())
+            _client_token = token
+        return _client
 
 
-def lookup_user_by_email(client: WebClient, email: str) -> Optional[str]:
+def lookup_user_by_email(
+    client: WebClient, email: str, directory: Optional[UserDirectory] = None
+) -> Optional[str]:
     """Look up a Slack user by their email address with smart fallbacks"""
-    email_variations = [email]
-    
-    # If it's a northeastern email, also try husky version
-    if '@northeastern.edu' in email:
-        husky_email = email.replace('@northeastern.edu', '@husky.neu.edu')
-        email_variations.append(husky_email)
-        print(f"🔄 Will also try: {husky_email}")
-    
-    # If it's a husky email, also try northeastern version  
-    elif '@husky.neu.edu' in email:
-        northeastern_email = email.replace('@husky.neu.edu', '@northeastern.edu')
-        email_variations.append(northeastern_email)
-        print(f"🔄 Will also try: {northeastern_email}")
-    
-    # Try each email variation
-    for email_attempt in email_variations:
-        print(f"🔍 Trying: {email_attempt}")
+    if directory is None:
+        directory = get_directory()
+    cached = directory.get(email)
+    if cached:
+        return cached
+
+    # Miss: try the email as given, then its husky/northeastern alias
+    for email_attempt in email_variants(email):
         try:
-            resp = client.users_lookupByEmail(email=email_attempt)
+            resp = _call_slack("users.lookupByEmail", client.users_lookupByEmail, email=email_attempt)
             user = resp.get("user")
             if user and not user.get("deleted", False):
                 user_id = user.get("id")
-                print(f"✅ Found with {email_attempt}: {user_id}")
+                directory.put(email, user_id)
                 return user_id
         except SlackApiError as e:
-            print(f"❌ Failed with {email_attempt}: {e}")
+            if e.response.get("error") != "users_not_found":
+                print(f"❌ Lookup failed for {email_attempt}: {e}")
             continue
     
-    print(f"❌ Could not find user with any email variation")
+    print(f"❌ Could not find Slack user for {email} or its alias")
     return None
 
 
-def batch_lookup_users(client: WebClient, email_list: List[str]) -> Dict[str, Optional[str]]:
-    mapping: Dict[str, Optional[str]] = {e: None for e in email_list}
+def _iter_members(client: WebClient, page_size: int = 200) -> Iterator[dict]:
+    # Stream users.list one page at a time so callers can stop early
+    cursor = None
+    while True:
+        resp = _call_slack("users.list", client.users_list, cursor=cursor, limit=page_size)
+        for member in resp.get("members", []):
+            yield member
+        cursor = resp.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return
+
+
+def batch_lookup_users(
+    client: WebClient, email_list: List[str], directory: Optional[UserDirectory] = None
+) -> Dict[str, Optional[str]]:
+    """Resolve many emails with one paginated users.list sweep.
+
+    Cached entries are answered from the directory. The sweep matches
+    husky/northeastern aliases as it goes and stops on the page where the
+    last wanted email turns up. If users.list itself fails, the remaining
+    emails fall back to per-email lookups.
+    """
+    if directory is None:
+        directory = get_directory()
+
+    mapping: Dict[str, Optional[str]] = {}
+    wanted: Dict[str, List[str]] = {}
+    for email in email_list:
+        mapping[email] = directory.get(email)
+        if mapping[email] is None:
+            wanted.setdefault(canonical_email(email), []).append(email)
+    if not wanted:
+        return mapping
+
+    seen: Dict[str, str] = {}
     try:
-        cursor = None
-        while True:
-            resp = client.users_list(cursor=cursor, limit=200)
-            members = resp.get("members", [])
-            for m in members:
-                if m.get("deleted"):
-                    continue
-                profile = m.get("profile", {})
-                mail = (profile.get("email") or "").lower()
-                if mail in mapping:
-                    mapping[mail] = m.get("id")
-            cursor = resp.get("response_metadata", {}).get("next_cursor")
-            if not cursor:
+        for member in _iter_members(client):
+            if member.get("deleted") or member.get("is_bot"):
+                continue
+            mail = canonical_email(member.get("profile", {}).get("email") or "")
+            if not mail:
+                continue
+            seen[mail] = member.get("id")
+            for email in wanted.pop(mail, []):
+                mapping[email] = member.get("id")
+            if not wanted:
                 break
-    except SlackApiError:
-        pass
+    except SlackApiError as e:
+        print(f"❌ users.list failed, falling back to per-email lookups: {e}")
+        for originals in wanted.values():
+            for email in originals:
+                mapping[email] = lookup_user_by_email(client, email, directory)
+        wanted = {}
+    finally:
+        # Everyone seen on the way is worth remembering, not just the wanted emails
+        directory.put_many(seen)
+
+    for originals in wanted.values():
+        for email in originals:
+            print(f"❌ Could not find Slack user for {email} or its alias")
     return mapping
 
 
-def send_dm(client: WebClient, user_id: str, message: str) -> bool:
+def get_reactions(client: WebClient, channel: str, ts: str) -> List[dict]:
+    resp = _call_slack("reactions.get", client.reactions_get, channel=channel, timestamp=ts)
+    return resp.get("message", {}).get("reactions", [])
+
+
+def schedule_message(client: WebClient, channel: str, text: str, post_at: int) -> Optional[str]:
+    """Queue a message for `post_at` (epoch seconds); returns its scheduled_message_id."""
+    try:
+        resp = _call_slack(
+            "chat.scheduleMessage", client.chat_scheduleMessage, channel=channel, text=text, post_at=post_at
+        )
+        return resp.get("scheduled_message_id")
+    except SlackApiError as e:
+        print(f"❌ Could not schedule message in {channel}: {e}")
+        return None
+
+
+def delete_scheduled_message(client: WebClient, channel: str, scheduled_message_id: str) -> bool:
     try:
-        client.chat_postMessage(channel=user_id, text=message)
-        time.sleep(1.0)
+        _call_slack(
+            "chat.deleteScheduledMessage",
+            client.chat_deleteScheduledMessage,
+            channel=channel,
+            scheduled_message_id=scheduled_message_id,
+        )
         return True
-    except SlackApiError:
+    except SlackApiError as e:
+        # Already delivered or already deleted; nothing left to cancel
+        if e.response.get("error") != "invalid_scheduled_message_id":
+            print(f"❌ Could not cancel scheduled message {scheduled_message_id}: {e}")
         return False
+
+
+@dataclass
+class DMResult:
+    user_id: str
+    ok: bool
+    channel: str = ""
+    ts: str = ""
+    error: str = ""
+
+
+def post_dm(client: WebClient, user_id: str, message: str, blocks: Optional[list] = None) -> DMResult:
+    try:
+        resp = _call_slack(
+            "chat.postMessage", client.chat_postMessage, channel=user_id, text=message, blocks=blocks
+        )
+        return DMResult(user_id=user_id, ok=True, channel=resp.get("channel", ""), ts=resp.get("ts", ""))
+    except SlackApiError as e:
+        return DMResult(user_id=user_id, ok=False, error=str(e.response.get("error", e)))
+    except Exception as e:
+        # Transport failures shouldn't take down the rest of a send_many batch
+        return DMResult(user_id=user_id, ok=False, error=str(e))
+
+
+# DM errors meaning the cached user ID no longer reaches that person
+STALE_USER_ERRORS = {"user_not_found", "account_inactive", "channel_not_found"}
+
+
+def forget_stale_user(email: str, result: DMResult) -> bool:
+    """Drop a directory entry whose DM failed because the account is gone or changed."""
+    if result.ok or result.error not in STALE_USER_ERRORS:
+        return False
+    get_directory().forget(email)
+    return True
+
+
+def send_dm(client: WebClient, user_id: str, message: str) -> bool:
+    return post_dm(client, user_id, message).ok
+
+
+def send_many(client: WebClient, messages: List[tuple], workers: int = 4) -> List[DMResult]:
+    """Send DMs concurrently; each message is (user_id, text) or (user_id, text, blocks).
+
+    Pacing comes from the shared chat.postMessage bucket, not from sleeping
+    between sends. Results are returned in the same order as `messages`.
+    """
+    if not messages:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(messages)))) as pool:
+        return list(pool.map(lambda m: post_dm(client, *m), messages))
+
+
+def schedule_many(client: WebClient, items: List[tuple], workers: int = 4) -> List[Optional[str]]:
+    """Schedule (channel, text, post_at) messages concurrently; IDs come back in input order."""
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(items)))) as pool:
+        return list(pool.map(lambda item: schedule_message(client, *item), items))
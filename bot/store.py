@@ -0,0 +1,244 @@
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from .config import (
+    CONFIG_RANGE,
+    MEMBER_HISTORY_RANGE,
+    ROSTER_RANGE,
+    ROSTER_SYNC_TTL_SEC,
+    SHEET_STORE_PATH,
+    STORE_RESYNC_WEEKS,
+    load_config,
+)
+from .roster import Roster
+from .sheets import (
+    MemberHistory,
+    PendingSnapshot,
+    SheetData,
+    TrackingSnapshot,
+    _batch_get_values,
+    _normalize_email,
+    _parse_config,
+    _parse_date,
+    _parse_history,
+    _parse_roster,
+    _week_start,
+    current_week_start,
+    load_pending_snapshot,
+    load_sheet_data,
+)
+
+TRACKING_WIDTH = 9  # A:I
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS roster ("
+    "position INTEGER PRIMARY KEY, name TEXT, email TEXT, email_key TEXT, team TEXT, status TEXT)",
+    "CREATE INDEX IF NOT EXISTS roster_email ON roster (email_key)",
+    "CREATE INDEX IF NOT EXISTS roster_team ON roster (team)",
+    "CREATE TABLE IF NOT EXISTS tracking ("
+    "row_num INTEGER PRIMARY KEY, email_key TEXT, selected_on TEXT, week_start TEXT, width INTEGER, "
+    "a TEXT, b TEXT, c TEXT, d TEXT, e TEXT, f TEXT, g TEXT, h TEXT, i TEXT)",
+    # week_start serves the sync window and this week's rows; (email_key, selected_on)
+    # answers the latest selection per member from the index alone
+    "CREATE INDEX IF NOT EXISTS tracking_week ON tracking (week_start)",
+    "CREATE INDEX IF NOT EXISTS tracking_email_selected ON tracking (email_key, selected_on)",
+    "DROP INDEX IF EXISTS tracking_email_week",
+    "DROP INDEX IF EXISTS tracking_selected",
+    "CREATE TABLE IF NOT EXISTS config (key TEXT PRIMARY KEY, value TEXT)",
+    "CREATE TABLE IF NOT EXISTS member_history ("
+    "email TEXT PRIMARY KEY, last_selected TEXT, times_selected INTEGER, times_completed INTEGER)",
+    "CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, value REAL)",
+]
+
+
+def _tracking_record(row_num: int, row: List[str]) -> tuple:
+    cells = [str(c) for c in row[:TRACKING_WIDTH]]
+    selected = _parse_date(cells[2]) if len(cells) > 2 else None
+    week = _week_start(selected).isoformat() if selected else None
+    padded = cells + [""] * (TRACKING_WIDTH - len(cells))
+    email_key = _normalize_email(cells[0]) if cells else ""
+    return (row_num, email_key, selected.isoformat() if selected else None, week, len(cells), *padded)
+
+
+class SheetStore:
+    """SQLite mirror of Roster, Tracking and Config, synced incrementally from Sheets.
+
+    Tracking is append-only apart from cell edits on recent rows, so a sync
+    re-reads only from the first row of the last `resync_weeks` weeks (or the
+    end of the table). The row just above that window is fetched too: if it no
+    longer matches, rows were inserted or deleted by hand (or compacted) and
+    everything is reloaded. Roster, Config and MemberHistory are small and
+    re-read once they are older than `roster_ttl`. Writes still go to Sheets through the batched helpers in
+    bot/sheets.py; they land in recent rows, so the next sync picks them up.
+    """
+
+    def __init__(
+        self,
+        path: str = SHEET_STORE_PATH,
+        resync_weeks: int = STORE_RESYNC_WEEKS,
+        roster_ttl: int = ROSTER_SYNC_TTL_SEC,
+    ):
+        self.path = path
+        self.resync_weeks = resync_weeks
+        self.roster_ttl = roster_ttl
+        self._lock = threading.Lock()
+        with sqlite3.connect(self.path) as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _window_start(self, conn) -> int:
+        cutoff = (current_week_start() - timedelta(weeks=self.resync_weeks)).isoformat()
+        (start,) = conn.execute("SELECT MIN(row_num) FROM tracking WHERE week_start >= ?", (cutoff,)).fetchone()
+        if start is None:
+            (last,) = conn.execute("SELECT MAX(row_num) FROM tracking").fetchone()
+            start = (last or 1) + 1
+        return start
+
+    def _row(self, conn, row_num: int) -> Optional[List[str]]:
+        record = conn.execute(
+            "SELECT width, a, b, c, d, e, f, g, h, i FROM tracking WHERE row_num = ?", (row_num,)
+        ).fetchone()
+        if record is None:
+            return None
+        return list(record[1:1 + record[0]])
+
+    def _synced_at(self, conn, name: str) -> float:
+        row = conn.execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0.0
+
+    def sync(self, service, spreadsheet_id: str, force_roster: bool = False) -> int:
+        """Pull what changed since the last sync; returns the number of Tracking rows read."""
+        with self._lock, sqlite3.connect(self.path) as conn:
+            roster_due = force_roster or time.time() - self._synced_at(conn, "roster") > self.roster_ttl
+            start = self._window_start(conn)
+            while True:
+                ranges = [f"Tracking!A{max(start, 2)}:I"]
+                if start > 2:
+                    ranges.append(f"Tracking!A{start - 1}:I{start - 1}")
+                if roster_due:
+                    ranges += [ROSTER_RANGE, CONFIG_RANGE, MEMBER_HISTORY_RANGE]
+                values = _batch_get_values(service, spreadsheet_id, ranges)
+
+                if start > 2:
+                    anchor = values[1][0] if values[1] else None
+                    if anchor != self._row(conn, start - 1):
+                        # Rows above the window moved; start over from the header. Compaction
+                        # does this and rewrites MemberHistory too, so reload that with it
+                        print("[store] Tracking rows were inserted or removed, reloading it in full")
+                        start = 2
+                        roster_due = True
+                        continue
+                break
+
+            window = values[0]
+            conn.execute("DELETE FROM tracking WHERE row_num >= ?", (start,))
+            conn.executemany(
+                "INSERT INTO tracking VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_tracking_record(row_num, row) for row_num, row in enumerate(window, start=start)],
+            )
+
+            if roster_due:
+                roster_values, config_values, history_values = values[-3:]
+                conn.execute("DELETE FROM roster")
+                conn.executemany(
+                    "INSERT INTO roster VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (position, name, email, _normalize_email(email), team, status)
+                        for position, (name, email, team, status) in enumerate(_parse_roster(roster_values))
+                    ],
+                )
+                conn.execute("DELETE FROM config")
+                conn.executemany("INSERT INTO config VALUES (?, ?)", list(_parse_config(config_values).items()))
+                conn.execute("DELETE FROM member_history")
+                conn.executemany(
+                    "INSERT INTO member_history VALUES (?, ?, ?, ?)",
+                    [
+                        (h.email, h.last_selected.isoformat() if h.last_selected else None,
+                         h.times_selected, h.times_completed)
+                        for h in _parse_history(history_values).values()
+                    ],
+                )
+                conn.execute("INSERT OR REPLACE INTO sync_state VALUES ('roster', ?)", (time.time(),))
+            conn.execute("INSERT OR REPLACE INTO sync_state VALUES ('tracking', ?)", (time.time(),))
+            return len(window)
+
+    def roster(self) -> Roster:
+        with sqlite3.connect(self.path) as conn:
+            return Roster.from_rows(conn.execute("SELECT name, email, team, status FROM roster ORDER BY position"))
+
+    def config(self) -> Dict[str, str]:
+        with sqlite3.connect(self.path) as conn:
+            return dict(conn.execute("SELECT key, value FROM config"))
+
+    def history(self) -> Dict[str, MemberHistory]:
+        with sqlite3.connect(self.path) as conn:
+            return {
+                email: MemberHistory(email, date.fromisoformat(last) if last else None, selected, completed)
+                for email, last, selected, completed in conn.execute("SELECT * FROM member_history")
+            }
+
+    def week_snapshot(self, week_start: Optional[date] = None) -> PendingSnapshot:
+        """One week's Tracking rows (default: this week), keyed by sheet row, from the week index."""
+        week = (week_start or current_week_start()).isoformat()
+        with sqlite3.connect(self.path) as conn:
+            records = conn.execute(
+                "SELECT row_num, width, a, b, c, d, e, f, g, h, i FROM tracking WHERE week_start = ?", (week,)
+            )
+            return PendingSnapshot({r[0]: list(r[2:2 + r[1]]) for r in records})
+
+    def last_selected(self) -> Dict[str, int]:
+        """Normalized email -> date ordinal of the latest selection in Tracking."""
+        with sqlite3.connect(self.path) as conn:
+            records = conn.execute(
+                "SELECT email_key, MAX(selected_on) FROM tracking WHERE selected_on IS NOT NULL GROUP BY email_key"
+            )
+            return {email: date.fromisoformat(selected).toordinal() for email, selected in records}
+
+    def sheet_data(self) -> SheetData:
+        """Roster, Config and history, with only this week's Tracking rows and the latest date per member."""
+        return SheetData(
+            roster=self.roster(),
+            tracking=self.week_snapshot(),
+            config=load_config().with_sheet_config(self.config()),
+            history=self.history(),
+            latest=self.last_selected(),
+        )
+
+
+_store: Optional[SheetStore] = None
+
+
+def get_store() -> Optional[SheetStore]:
+    """Process-wide store, or None when SHEET_STORE_PATH is not set."""
+    global _store
+    if _store is None and SHEET_STORE_PATH:
+        _store = SheetStore()
+    return _store
+
+
+def sync_sheet_data(service, spreadsheet_id: str) -> SheetData:
+    """Roster, Tracking and Config from the local mirror when enabled, else straight from Sheets.
+
+    From the mirror, `tracking` holds only this week's rows; selection needs
+    nothing older than each member's latest date, which comes from the index.
+    """
+    store = get_store()
+    if store is None:
+        return load_sheet_data(service, spreadsheet_id)
+    store.sync(service, spreadsheet_id)
+    return store.sheet_data()
+
+
+def load_reminder_snapshot(service, spreadsheet_id: str) -> TrackingSnapshot:
+    """This week's rows from the Pending tab, falling back to Tracking when it isn't built yet."""
+    pending = load_pending_snapshot(service, spreadsheet_id)
+    if pending is not None:
+        return pending
+    store = get_store()
+    if store is None:
+        return load_sheet_data(service, spreadsheet_id).tracking
+    store.sync(service, spreadsheet_id)
+    return store.week_snapshot()
@@ -0,0 +1,121 @@
+from array import array
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import compress
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@lru_cache(maxsize=4096)
+def date_ordinal(value: Any) -> int:
+    """Ordinal of a YYYY-MM-DD cell, or 0 if it isn't one.
+
+    Tracking holds one distinct date per selection day, so each string is
+    parsed once and every later row is a cache hit.
+    """
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d").toordinal()
+    except ValueError:
+        return 0
+
+
+def week_ordinal(ordinal: int) -> int:
+    # Ordinal of that week's Monday (ordinal 1, 0001-01-01, is a Monday)
+    return ordinal - (ordinal - 1) % 7
+
+
+def _week_of(value: Any) -> int:
+    ordinal = date_ordinal(value) if value else 0
+    return week_ordinal(ordinal) if ordinal else 0
+
+
+def _count(value: Any) -> int:
+    text = str(value).strip()
+    return int(text) if text.isdigit() else 0
+
+
+def _status(row: List[Any]) -> Tuple[bool, int]:
+    # D=form_completed, E=reminders_sent
+    completed = len(row) > 3 and str(row[3]).strip().upper() == "TRUE"
+    return completed, _count(row[4]) if len(row) > 4 else 0
+
+
+def _decode(column: List[Any], typecode: str, convert: Callable[[Any], Any]) -> array:
+    # One conversion per distinct raw value
+    decoded = {raw: convert(raw) for raw in dict.fromkeys(column)}
+    return array(typecode, map(decoded.__getitem__, column))
+
+
+def _encode(column: List[Any], normalize: Callable[[Any], str]) -> Tuple[List[str], array]:
+    # Dictionary-encode: distinct normalized values, plus each row's position in that list
+    codes: Dict[str, int] = {}
+    raw_codes = {raw: codes.setdefault(normalize(raw), len(codes)) for raw in dict.fromkeys(column)}
+    return list(codes), array("l", map(raw_codes.__getitem__, column))
+
+
+class TrackingTable:
+    """Tracking rows decoded once into typed columns.
+
+    Emails and teams are dictionary-encoded (normalized strings in `emails`
+    and `teams`, their positions in `email_ids` and `team_ids`), and dates are
+    int ordinals, 0 where the cell isn't a date. Filters compare whole
+    columns at once and return row positions.
+    """
+
+    def __init__(self, rows: List[List[Any]], row_nums: Optional[Iterable[int]] = None):
+        # rows[i] lives on sheet row row_nums[i] (default i + 2, below the header)
+        self.row_nums = array("l", row_nums if row_nums is not None else range(2, len(rows) + 2))
+        self.widths = array("l", map(len, rows))
+        # Columns A-E, pulled out with C-level maps; short rows are padded first
+        if min(self.widths, default=5) < 5:
+            rows = [row + [""] * (5 - len(row)) for row in rows]
+        emails, teams, dates, completed, reminders = (list(map(itemgetter(col), rows)) for col in range(5))
+
+        # Each column has few distinct raw values, so decode those once and map the rest
+        self.emails, self.email_ids = _encode(emails, lambda v: str(v).strip().lower())
+        self.teams, self.team_ids = _encode(teams, lambda v: str(v).strip().lower())
+        self.selected = _decode(dates, "l", lambda v: date_ordinal(v) if v else 0)
+        self.completed = _decode(completed, "b", lambda v: str(v).strip().upper() == "TRUE")
+        self.reminders = _decode(reminders, "l", _count)
+        self.weeks = _decode(dates, "l", _week_of)
+
+    def refresh(self, pos: int, row: List[Any]) -> None:
+        """Re-read the mutable columns after a write to the row at `pos`."""
+        self.completed[pos], self.reminders[pos] = _status(row)
+        self.widths[pos] = len(row)
+
+    def __len__(self) -> int:
+        return len(self.selected)
+
+    def email(self, pos: int) -> str:
+        return self.emails[self.email_ids[pos]]
+
+    def team(self, pos: int) -> str:
+        return self.teams[self.team_ids[pos]]
+
+    def in_week(self, week_start: date) -> List[int]:
+        return list(compress(range(len(self)), map(week_start.toordinal().__eq__, self.weeks)))
+
+    def team_counts_in_week(self, week_start: date) -> Dict[str, int]:
+        """Team -> members with a row in that week, counting each email once (its first row)."""
+        first: Dict[int, int] = {}
+        for pos in self.in_week(week_start):
+            first.setdefault(self.email_ids[pos], pos)
+        counts: Dict[str, int] = {}
+        for team in map(self.team, first.values()):
+            counts[team] = counts.get(team, 0) + 1
+        return counts
+
+    def last_selected(self) -> Dict[str, int]:
+        """Normalized email -> latest selection date ordinal, over dated rows."""
+        latest: Dict[int, int] = {}
+        for email_id, ordinal in zip(self.email_ids, self.selected):
+            if ordinal > latest.get(email_id, 0):
+                latest[email_id] = ordinal
+        return {self.emails[email_id]: ordinal for email_id, ordinal in latest.items()}
+
+    def week_rows(self, week_start: date) -> Dict[str, int]:
+        """Normalized email -> sheet row for rows selected in that week; the first row per email wins."""
+        positions = self.in_week(week_start)
+        pairs = list(zip(map(self.email, positions), map(self.row_nums.__getitem__, positions)))
+        return dict(reversed(pairs))
@@ -5,11 +5,11 @@ Check for reactions on bot messages and update tracking
 
 from bot.config import load_config
 from bot.slack import get_slack_client
-from bot.sheets import connect_to_sheets, mark_completed
-import time
+from bot.sheets import connect_to_sheets, load_tracking_snapshot
+from bot.completion import check_reaction_completions
 
 def check_reactions():
-    """Check for reactions on recent bot messages"""
+    """Check this week's pending feedback DMs for a 👍 and mark them completed"""
     cfg = load_config()
     client = get_slack_client()
     sheets_service = connect_to_sheets(cfg.google_creds_path)
@@ -17,58 +17,13 @@ def check_reactions():
     print("🔍 Checking for reactions on bot messages...")
     
     try:
-        # Get recent selections from tracking sheet
-        result = sheets_service.spreadsheets().values().get(
-            spreadsheetId=cfg.google_sheets_id,
-            range="Tracking!A:F"
-        ).execute()
-        
-        rows = result.get('values', [])
-        if len(rows) <= 1:
-            print("No recent selections to check")
+        # Tracking stores each DM's channel and ts, so this is one reactions.get per pending row
+        snapshot = load_tracking_snapshot(sheets_service, cfg.google_sheets_id)
+        if not snapshot.pending_rows():
+            print("No pending selections to check")
             return
-            
-        updated_count = 0
         
-        # Check each recent selection for reactions
-        for i, row in enumerate(rows[1:], 1):  # Skip header
-            if len(row) < 6:
-                continue
-                
-            timestamp, name, email, team, slack_id, status = row
-            
-            if status == "Completed":
-                continue  # Already completed
-                
-            print(f"Checking {name} ({email})...")
-            
-            try:
-                # Get recent DM history for this user
-                response = client.conversations_history(
-                    channel=slack_id,
-                    limit=20  # Check last 20 messages
-                )
-                
-                messages = response.get('messages', [])
-                
-                # Look for bot messages with reactions
-                for msg in messages:
-                    # Check if this is a bot message (has bot_id)
-                    if msg.get('bot_id') and 'reactions' in msg:
-                        print(f"  ✅ Found reaction on bot message!")
-                        
-                        # Update status to completed
-                        try:
-                            mark_completed(sheets_service, cfg.google_sheets_id, email)
-                            print(f"  ✅ Updated {name} to Completed")
-                            updated_count += 1
-                        except Exception as e:
-                            print(f"  ❌ Failed to update {name}: {e}")
-                        break
-                        
-            except Exception as e:
-                print(f"  ❌ Error checking {name}: {e}")
-                
+        updated_count = check_reaction_completions(client, sheets_service, cfg.google_sheets_id, snapshot)
         print(f"\n📊 Updated {updated_count} people to Completed status")
         
     except Exception as e:
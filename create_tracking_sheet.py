@@ -25,11 +25,11 @@ def create_tracking_sheet(service, spreadsheet_id):
     ).execute()
     
     # Add header row
-    header = [['Email', 'Team', 'Date_Selected', 'Form_Completed', 'Reminders_Sent', 'Date_Completed']]
+    header = [['Email', 'Team', 'Date_Selected', 'Form_Completed', 'Reminders_Sent', 'Date_Completed', 'DM_Channel', 'Message_TS', 'Scheduled_Reminders']]
     
     service.spreadsheets().values().update(
         spreadsheetId=spreadsheet_id,
-        range='Tracking!A1:F1',
+        range='Tracking!A1:I1',
         valueInputOption='USER_ENTERED',
         body={'values': header}
     ).execute()
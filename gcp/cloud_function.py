@@ -12,10 +12,19 @@ from typing import Dict, Any
 # Add the bot module to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from bot.config import load_config
+from bot.config import FUNCTION_TIMEOUT_SEC, load_config
+from bot.journal import Deadline, RunJournal, default_run_id
 from bot.slack import get_slack_client
-from bot.sheets import connect_to_sheets, mark_completed
-from bot.selection import run_full_selection
+from bot.sheets import get_sheets_service, load_tracking_snapshot, rebuild_pending
+from bot.store import load_reminder_snapshot, sync_sheet_data
+from bot.pipeline import (
+    fan_out_selection_dms,
+    pending_reminders,
+    plan_selection,
+    send_reminder_dms,
+    send_selection_dms,
+)
+from bot.completion import check_reaction_completions
 
 def main(request):
     """
@@ -35,7 +44,7 @@ def main(request):
         
         # Handle different actions
         if action == 'weekly_selection':
-            return handle_weekly_selection()
+            return handle_weekly_selection(data.get('schedule_reminders'))
         elif action == 'send_first_reminders':
             return handle_first_reminders()
         elif action == 'send_final_reminders':
@@ -50,43 +59,55 @@ def main(request):
         print(f"❌ Error in main: {e}")
         return f"Error: {str(e)}", 500
 
-def handle_weekly_selection():
+def handle_weekly_selection(schedule_reminders=None):
     """Run weekly selection process"""
     print("📅 Running weekly selection...")
+    deadline = Deadline(budget_sec=FUNCTION_TIMEOUT_SEC)
     
     try:
         cfg = load_config()
         client = get_slack_client()
         
-        # Run the selection process
-        selections = run_full_selection()
+        # One batchGet, or only the recent Tracking rows when SHEET_STORE_PATH is set
+        sheets_service = get_sheets_service(cfg.google_creds_path)
+        data = sync_sheet_data(sheets_service, cfg.google_sheets_id)
+        
+        # A journal from an earlier invocation this week means we are resuming it
+        journal = RunJournal(default_run_id("weekly_selection"))
+        if journal.finished:
+            return "Weekly selection already completed this week", 200
+        selections = plan_selection(data, journal)
+        # Drop last week's rows from Pending; this run's rows are added as they are logged
+        rebuild_pending(sheets_service, cfg.google_sheets_id, data.tracking)
         
         if not selections:
             print("❌ No selections made")
+            journal.finish()
+            journal.save()
             return "No selections made", 200
         
-        # Send DMs and log to sheets
-        sheets_service = connect_to_sheets(cfg.google_creds_path)
-        success_count = 0
+        # Resolve, DM concurrently and log everyone to sheets in bulk
+        # The request can override SCHEDULE_REMINDERS for a single run
+        if schedule_reminders is None:
+            schedule_reminders = cfg.schedule_reminders
+        if cfg.fan_out_workers:
+            # One worker thread per team, so large rosters take as long as the biggest team
+            success_count = fan_out_selection_dms(
+                client, cfg.google_creds_path, cfg.google_sheets_id, data.roster, selections,
+                team_workers=cfg.fan_out_workers,
+                schedule_reminders=schedule_reminders, journal=journal, deadline=deadline,
+            )
+        else:
+            success_count = send_selection_dms(
+                client, sheets_service, cfg.google_sheets_id, data.roster, selections,
+                schedule_reminders=schedule_reminders, journal=journal, deadline=deadline,
+            )
         
-        for name, email, team in selections:
-            print(f"📤 Sending DM to {name} ({email})")
-            
-            # Look up user in Slack
-            user_id = lookup_user_by_email(client, email)
-            if user_id:
-                # Send DM (you'll need to implement this)
-                print(f"✅ Found {name} in Slack: {user_id}")
-                success_count += 1
-                
-                # Log to sheets
-                try:
-                    log_selection(sheets_service, cfg.google_sheets_id, email, name, team)
-                    print(f"📊 Logged {name} to sheets")
-                except Exception as e:
-                    print(f"❌ Failed to log {name}: {e}")
-            else:
-                print(f"❌ Could not find {name} in Slack")
+        if not journal.finished:
+            # Non-2xx so Cloud Scheduler retries; the retry resumes from the journal
+            result = f"Weekly selection checkpointed after {success_count} DMs; retry to resume."
+            print(result)
+            return result, 503
         
         result = f"Weekly selection completed. {success_count}/{len(selections)} people contacted."
         print(result)
@@ -96,52 +117,53 @@ def handle_weekly_selection():
         print(f"❌ Error in weekly selection: {e}")
         return f"Weekly selection failed: {str(e)}", 500
 
-def handle_first_reminders():
-    """Send first reminders to non-responders"""
-    print("📬 Sending first reminders...")
+def _handle_reminders(label, wanted_count):
+    """Send a reminder to non-responders who have had `wanted_count` reminders so far"""
+    print(f"📬 Sending {label} reminders...")
+    deadline = Deadline(budget_sec=FUNCTION_TIMEOUT_SEC)
     
     try:
         cfg = load_config()
         client = get_slack_client()
-        sheets_service = connect_to_sheets(cfg.google_creds_path)
+        sheets_service = get_sheets_service(cfg.google_creds_path)
         
-        # Get pending responses
-        pending = get_pending_responses(sheets_service, cfg.google_sheets_id)
+        # This week's rows from the Pending tab; the snapshot is reused for every row update below
+        snapshot = load_reminder_snapshot(sheets_service, cfg.google_sheets_id)
+        # Counts include reminders Slack already delivered from the schedule
+        pending = pending_reminders(sheets_service, cfg.google_sheets_id, snapshot)
+        pending = [(email, team, count) for email, team, count in pending if count == wanted_count]
         
         if not pending:
             print("✅ No pending responses to remind")
             return "No pending responses", 200
         
-        reminder_count = 0
-        for email, team, reminder_count in pending:
-            print(f"📤 Sending first reminder to {email}")
-            
-            # Look up user and send reminder
-            user_id = lookup_user_by_email(client, email)
-            if user_id:
-                # Send reminder (implement this)
-                print(f"✅ Sent reminder to {email}")
-                reminder_count += 1
-                
-                # Update reminder count in sheets
-                update_reminder_count(sheets_service, cfg.google_sheets_id, email)
-            else:
-                print(f"❌ Could not find {email} in Slack")
-        
-        result = f"First reminders sent to {reminder_count} people"
+        # Reminder counts are committed after each chunk, so a retry only sees who is left
+        journal = RunJournal(default_run_id(f"{label}_reminders"))
+        reminder_count = send_reminder_dms(
+            client, sheets_service, cfg.google_sheets_id, snapshot, pending,
+            journal=journal, deadline=deadline,
+        )
+        
+        if not journal.finished:
+            result = f"{label.capitalize()} reminders checkpointed after {reminder_count}; retry to resume."
+            print(result)
+            return result, 503
+        
+        result = f"{label.capitalize()} reminders sent to {reminder_count} people"
         print(result)
         return result, 200
         
     except Exception as e:
-        print(f"❌ Error in first reminders: {e}")
-        return f"First reminders failed: {str(e)}", 500
+        print(f"❌ Error in {label} reminders: {e}")
+        return f"{label.capitalize()} reminders failed: {str(e)}", 500
+
+def handle_first_reminders():
+    """Send first reminders to non-responders"""
+    return _handle_reminders("first", 0)
 
 def handle_final_reminders():
     """Send final reminders to non-responders"""
-    print("📬 Sending final reminders...")
-    
-    # Similar to first reminders but with different message
-    return handle_first_reminders()  # For now, same logic
+    return _handle_reminders("final", 1)
 
 def handle_reaction_checking():
     """Check for reactions and update sheets"""
@@ -150,57 +172,14 @@ def handle_reaction_checking():
     try:
         cfg = load_config()
         client = get_slack_client()
-        sheets_service = connect_to_sheets(cfg.google_creds_path)
-        
-        # Get all DM conversations
-        conversations_response = client.conversations_list(types='im', limit=100)
-        
-        if not conversations_response['ok']:
-            print(f"❌ Failed to get conversations: {conversations_response}")
-            return "Failed to get conversations", 500
+        sheets_service = get_sheets_service(cfg.google_creds_path)
+        snapshot = load_tracking_snapshot(sheets_service, cfg.google_sheets_id)
         
-        conversations = conversations_response['channels']
-        updated_count = 0
-        
-        for conv in conversations:
-            user_id = conv['user']
-            
-            try:
-                # Get messages in this conversation
-                messages_response = client.conversations_history(
-                    channel=conv['id'], 
-                    limit=20
-                )
-                
-                if not messages_response['ok']:
-                    continue
-                
-                messages = messages_response['messages']
-                
-                # Look for bot messages
-                for msg in messages:
-                    if 'You were randomly selected from the Community team' in msg.get('text', ''):
-                        # Check reactions
-                        reactions = msg.get('reactions', [])
-                        has_reaction = any(reaction['count'] > 0 for reaction in reactions)
-                        
-                        if has_reaction:
-                            # Get user email and mark as completed
-                            user_info = client.users_info(user=user_id)
-                            if user_info['ok']:
-                                user_email = user_info['user']['profile'].get('email', '').lower()
-                                if user_email:
-                                    try:
-                                        mark_completed(sheets_service, cfg.google_sheets_id, user_email)
-                                        print(f"✅ Marked {user_email} as completed")
-                                        updated_count += 1
-                                    except Exception as e:
-                                        print(f"❌ Failed to update {user_email}: {e}")
-                        break
-                        
-            except Exception as e:
-                print(f"❌ Error processing conversation: {e}")
-                continue
+        # Each pending row carries its DM channel and ts: one reactions.get per row,
+        # and all completions are written in one batchUpdate
+        updated_count = check_reaction_completions(
+            client, sheets_service, cfg.google_sheets_id, snapshot
+        )
         
         result = f"Reaction checking completed. Updated {updated_count} people."
         print(result)
@@ -211,22 +190,8 @@ def handle_reaction_checking():
         return f"Reaction checking failed: {str(e)}", 500
 
 # Import the functions we need (these should be in your bot modules)
-def lookup_user_by_email(client, email):
-    """Look up user by email (from bot.slack)"""
-    from bot.slack import lookup_user_by_email
-    return lookup_user_by_email(client, email)
-
-def log_selection(service, spreadsheet_id, email, name, team):
-    """Log selection to sheets (from bot.sheets)"""
-    from bot.sheets import log_selection
-    return log_selection(service, spreadsheet_id, email, name, team)
-
-def get_pending_responses(service, spreadsheet_id):
+def get_pending_responses(service, spreadsheet_id, snapshot=None):
     """Get pending responses (from bot.sheets)"""
     from bot.sheets import get_pending_responses
-    return get_pending_responses(service, spreadsheet_id)
+    return get_pending_responses(service, spreadsheet_id, snapshot=snapshot)
 
-def update_reminder_count(service, spreadsheet_id, email):
-    """Update reminder count (from bot.sheets)"""
-    from bot.sheets import update_reminder_count
-    return update_reminder_count(service, spreadsheet_id, email)
@@ -14,6 +14,8 @@ For new team members:
 import logging
 from slack_bolt import App
 from config.settings import bot_config
+from bot.completion import parse_completion_key, start_completion_tracker
+from bot.messages import SUBMITTED_ACTION_ID, render_submitted_blocks
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,12 @@ def setup_event_handlers(app: App):
     """
     logger.info("Setting up event handlers...")
     
+    # Tracks this week's feedback DMs so a 👍 marks completion right away.
+    # None when Google Sheets isn't configured for this app.
+    completion_tracker = start_completion_tracker()
+    if completion_tracker is None:
+        logger.info("Feedback completion tracking is off (no Google Sheets config)")
+    
     # Handle user joining a channel
     @app.event("member_joined_channel")
     def handle_member_joined(event, say):
@@ -70,6 +78,14 @@ def setup_event_handlers(app: App):
             item = event.get("item", {})
             channel_id = item.get("channel")
             
+            # 👍 on a tracked feedback DM: queue the completion write and stop here.
+            # Reactions on anything else fall through after one dict lookup.
+            if completion_tracker is not None and completion_tracker.handle_reaction(
+                reaction, channel_id, item.get("ts")
+            ):
+                logger.info(f"Feedback completion from user {user_id} queued")
+                return
+            
             logger.info(f"Reaction '{reaction}' added by user {user_id}")
             
             # Respond to specific reactions
@@ -153,6 +169,48 @@ def setup_event_handlers(app: App):
         except Exception as e:
             logger.error(f"Error handling help button: {e}")
     
+    # Handle the "Submitted" button on the weekly feedback DM
+    @app.action(SUBMITTED_ACTION_ID)
+    def handle_feedback_submitted(ack, body, respond):
+        """
+        Handle when someone clicks "Submitted" on their feedback DM.
+        
+        The button's value is the Tracking row key ("email|week start"),
+        so no lookups or history reads are needed: we ack right away,
+        queue the completion write and swap the button for a thank-you.
+        
+        Args:
+            ack: Function to acknowledge the action
+            body: The action body data
+            respond: Function to update the original message
+        """
+        ack()
+        
+        try:
+            user_id = body.get("user", {}).get("id")
+            key = body.get("actions", [{}])[0].get("value", "")
+            
+            if completion_tracker is None:
+                logger.error(f"Submitted clicked by {user_id} but completion tracking is off")
+                respond(text="Sorry, I couldn't record that right now. Please react with 👍 instead.",
+                        replace_original=False)
+                return
+            
+            email, week_start = parse_completion_key(key)
+            completion_tracker.submit(email, week_start)
+            
+            # A later 👍 on the same DM shouldn't queue a second write
+            container = body.get("container", {})
+            completion_tracker.forget(container.get("channel_id"), container.get("message_ts"))
+            
+            logger.info(f"Feedback completion from user {user_id} queued via button")
+            
+            original_text = body.get("message", {}).get("text", "")
+            respond(text=original_text, blocks=render_submitted_blocks(original_text), replace_original=True)
+            
+        except Exception as e:
+            logger.error(f"Error handling feedback submitted button: {e}")
+    
     # Handle when the bot is added to a channel
     @app.event("app_home_opened")
     def handle_app_home_opened(event, say):
@@ -1,76 +1,159 @@
 import json
 
-from bot.config import load_config
-from bot.sheets import connect_to_sheets, get_roster, get_recent_selections, get_pending_responses, log_selection, update_reminder_count
-from bot.selection import run_full_selection
-from bot.slack import get_slack_client, lookup_user_by_email, send_dm
-from bot.messages import render_initial, render_first_reminder, render_final_reminder
+# Only json is imported at module load. bot.sheets, bot.slack and bot.pipeline
+# pull in googleapiclient, google.auth and slack_sdk, so they are imported
+# inside the handler once an action needs them; on warm invocations they are
+# already in sys.modules, and the Sheets service and WebClient are reused
+# from their module-level caches. See scripts/import_time_report.py.
+
+ACTIONS = ("select", "select_team", "remind", "final", "compact")
 
 
 def lambda_handler(event, context):
+    event = event or {}
+    action = event.get("action", "select")
+    if action not in ACTIONS:
+        return _error(400, f"Unknown action: {action}")
+
+    from bot.config import load_config
+    from bot.journal import Deadline, RunJournal, default_run_id
+    from bot.sheets import get_sheets_service
+
     cfg = load_config()
-    service = connect_to_sheets(cfg.google_creds_path)
+    service = get_sheets_service(cfg.google_creds_path)
+    deadline = Deadline(context)
+
+    if action == "compact":
+        from bot.compaction import compact_tracking
+
+        try:
+            plan = compact_tracking(service, cfg.google_sheets_id)
+            return _ok({"kept": len(plan.keep), "folded": plan.folded,
+                        "archived": {tab: len(rows) for tab, rows in plan.archive.items()}})
+        except Exception as e:
+            return _error(500, str(e))
+
+    # Every other action talks to Slack; compact never needs the client
+    from bot.slack import get_slack_client
+
     client = get_slack_client()
 
-    action = (event or {}).get("action", "select")
+    if action == "select_team":
+        try:
+            return _select_team(event, context, cfg, service, client, deadline)
+        except Exception as e:
+            return _error(500, str(e))
+
+    # Re-invoking with the same run_id (default: action + week) resumes a run
+    # that stopped at its deadline instead of starting over
+    journal = RunJournal(event.get("run_id") or default_run_id(action))
+    if journal.finished:
+        return _ok({"run_id": journal.run_id, "complete": True, "sent": 0})
 
     try:
         if action == "select":
-            roster = get_roster(service, cfg.google_sheets_id)
-            recent = get_recent_selections(service, cfg.google_sheets_id, weeks=cfg.cooldown_weeks)
-            selections = run_full_selection(roster, recent)
-            sent = 0
-            for name, email in selections:
-                user_id = lookup_user_by_email(client, email)
-                if not user_id:
-                    continue
-                team = _team_for_email(roster, email)
-                if send_dm(client, user_id, render_initial(name, team)):
-                    log_selection(service, cfg.google_sheets_id, email, name, team)
-                    sent += 1
-            return _ok({"processed": len(selections), "sent": sent})
-
-        elif action == "remind":
-            pending = get_pending_responses(service, cfg.google_sheets_id)
-            sent = 0
-            for email, team, count in pending:
-                if count != 0:
-                    continue
-                user_id = lookup_user_by_email(client, email)
-                if not user_id:
-                    continue
-                if send_dm(client, user_id, render_first_reminder(team)):
-                    update_reminder_count(service, cfg.google_sheets_id, email)
-                    sent += 1
-            return _ok({"sent": sent})
-
-        elif action == "final":
-            pending = get_pending_responses(service, cfg.google_sheets_id)
-            sent = 0
-            for email, team, count in pending:
-                if count != 1:
-                    continue
-                user_id = lookup_user_by_email(client, email)
-                if not user_id:
-                    continue
-                if send_dm(client, user_id, render_final_reminder(team)):
-                    update_reminder_count(service, cfg.google_sheets_id, email)
-                    sent += 1
-            return _ok({"sent": sent})
-
-        else:
-            return _error(400, f"Unknown action: {action}")
+            from bot.pipeline import fan_out_selection_dms, partition_by_team, plan_selection, send_selection_dms
+            from bot.sheets import rebuild_pending
+            from bot.store import sync_sheet_data
+
+            data = sync_sheet_data(service, cfg.google_sheets_id)
+            selections = plan_selection(data, journal)
+            # Drop last week's rows from Pending; this run's rows are added as they are logged
+            rebuild_pending(service, cfg.google_sheets_id, data.tracking)
+            schedule = event.get("schedule_reminders", cfg.schedule_reminders)
+            fan_out = event.get("fan_out", "threads" if cfg.fan_out_workers else "")
+
+            if fan_out == "invoke":
+                # One async invocation per team; each worker journals and resumes on its own
+                partitions = partition_by_team(data.roster, selections)
+                for team, people in partitions.items():
+                    _invoke_async(context, {
+                        "action": "select_team",
+                        "run_id": journal.run_id,
+                        "team": team,
+                        "selections": people,
+                        "schedule_reminders": schedule,
+                    })
+                journal.finish()
+                journal.save()
+                return _ok({"run_id": journal.run_id, "complete": True,
+                            "processed": len(selections), "teams": len(partitions)})
+
+            if fan_out == "threads":
+                sent = fan_out_selection_dms(
+                    client, cfg.google_creds_path, cfg.google_sheets_id, data.roster, selections,
+                    team_workers=event.get("fan_out_workers", cfg.fan_out_workers or 4),
+                    schedule_reminders=schedule, journal=journal, deadline=deadline,
+                )
+            else:
+                sent = send_selection_dms(
+                    client, service, cfg.google_sheets_id, data.roster, selections,
+                    schedule_reminders=schedule, journal=journal, deadline=deadline,
+                )
+            return _ok({"run_id": journal.run_id, "complete": journal.finished,
+                        "processed": len(selections), "sent": sent})
+
+        elif action in ("remind", "final"):
+            # remind goes to people with no reminders yet, final to those with one
+            from bot.pipeline import pending_reminders, send_reminder_dms
+            from bot.store import load_reminder_snapshot
+
+            wanted_count = 0 if action == "remind" else 1
+            # Reads only this week's rows from the Pending tab
+            snapshot = load_reminder_snapshot(service, cfg.google_sheets_id)
+            # Counts include reminders Slack already delivered from the schedule
+            pending = pending_reminders(service, cfg.google_sheets_id, snapshot)
+            pending = [(email, team, count) for email, team, count in pending if count == wanted_count]
+            sent = send_reminder_dms(
+                client, service, cfg.google_sheets_id, snapshot, pending, journal=journal, deadline=deadline
+            )
+            return _ok({"run_id": journal.run_id, "complete": journal.finished, "sent": sent})
 
     except Exception as e:
         return _error(500, str(e))
 
 
-def _team_for_email(roster, email):
-    email_lower = email.lower()
-    for name, em, team, status in roster:
-        if em.lower() == email_lower:
-            return team
-    return ""
+def _select_team(event, context, cfg, service, client, deadline):
+    """Fan-out worker: lookup, DM and log one team's share of a selection run."""
+    from bot.journal import RunJournal
+    from bot.pipeline import send_selection_dms
+    from bot.roster import Member, Roster
+    from bot.sheets import current_week_start, load_tracking_snapshot
+
+    team = event.get("team", "")
+    journal = RunJournal(event["run_id"]).child(team or "unassigned")
+    if journal.finished:
+        return _ok({"run_id": journal.run_id, "complete": True, "sent": 0})
+
+    # A resumed worker may land on a fresh container without the journal;
+    # Tracking rows from this week still tell us who was already DMed
+    snapshot = load_tracking_snapshot(service, cfg.google_sheets_id)
+    week_start = current_week_start()
+    people = [
+        (name, email) for name, email in event.get("selections", [])
+        if snapshot.find_row(email, week_start) is None
+    ]
+    roster = Roster(Member(name, email, team) for name, email in people)
+    sent = send_selection_dms(
+        client, service, cfg.google_sheets_id, roster, people,
+        schedule_reminders=event.get("schedule_reminders", cfg.schedule_reminders),
+        journal=journal, deadline=deadline,
+    )
+    if not journal.finished:
+        # Hand the rest of the team to a fresh invocation
+        _invoke_async(context, event)
+    return _ok({"run_id": journal.run_id, "complete": journal.finished, "sent": sent})
+
+
+def _invoke_async(context, payload):
+    # boto3 ships with the Lambda runtime; imported here so local runs don't need it
+    import boto3
+
+    boto3.client("lambda").invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType="Event",
+        Payload=json.dumps(payload).encode("utf-8"),
+    )
 
 
 def _ok(body_dict):
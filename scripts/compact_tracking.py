@@ -0,0 +1,26 @@
+import argparse
+import sys
+
+from bot.compaction import compact_tracking
+from bot.config import load_config
+from bot.sheets import connect_to_sheets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old Tracking rows into MemberHistory and semester tabs")
+    parser.add_argument("--dry-run", action="store_true", help="show what would move without writing")
+    args = parser.parse_args()
+
+    cfg = load_config()
+    service = connect_to_sheets(cfg.google_creds_path)
+
+    plan = compact_tracking(service, cfg.google_sheets_id, dry_run=args.dry_run)
+
+    prefix = "Would archive" if args.dry_run else "Archived"
+    for tab, rows in sorted(plan.archive.items()):
+        print(f"{prefix} {len(rows)} rows to {tab}")
+    print(f"Done. Kept {len(plan.keep)} Tracking rows, folded {plan.folded} into MemberHistory.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAMBDA_DIR = os.path.join(REPO_ROOT, "lambda")
+
+# What a cold invocation imports: the handler module itself, then the modules
+# each action pulls in lazily ("lambda" is a keyword, so run from lambda/)
+SCENARIOS = {
+    "module": "import handler",
+    "actions": "import handler, bot.config, bot.journal, bot.slack, bot.pipeline",
+    "service": "import handler, bot.pipeline; from googleapiclient.discovery import build",
+}
+
+
+def _import_times(statement):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=LAMBDA_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    # "import time: self [us] | cumulative | imported package"
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us), len(name) - len(name.lstrip())))
+
+    # Interpreter startup (site and whatever it loads) comes first and isn't ours
+    for i, (name, _self, _cumulative, indent) in enumerate(rows):
+        if name == "site" and indent == 1:
+            return rows[i + 1:]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import time on the Lambda cold path")
+    parser.add_argument("scenario", nargs="?", default="module", choices=sorted(SCENARIOS))
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    args = parser.parse_args()
+
+    rows = _import_times(SCENARIOS[args.scenario])
+    # Top-level imports (one space of indent) add up to the total
+    total_us = sum(cumulative for _name, _self, cumulative, indent in rows if indent == 1)
+
+    print(f"Scenario: {args.scenario} ({SCENARIOS[args.scenario]})")
+    print(f"Total import time: {total_us / 1000:.1f} ms across {len(rows)} modules")
+    print(f"\nSlowest {args.top} by cumulative time:")
+    for name, self_us, cumulative_us, _indent in sorted(rows, key=lambda r: r[2], reverse=True)[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import argparse
+import os
+import random
+import sys
+
+from bot.simulator import scale_team_sizes, simulate, synthetic_roster, team_sizes_from_csv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CSV = os.path.join(REPO_ROOT, "roster_for_manual_upload.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay weekly selection over a synthetic roster, in memory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--members", type=int, default=0, help="roster size (default: the CSV's own size)")
+    parser.add_argument("--weeks", type=int, default=104)
+    parser.add_argument("--csv", default=DEFAULT_CSV, help="roster CSV whose team sizes are scaled")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild rotations every week, like scheduled runs")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (it slows every allocation)")
+    parser.add_argument("--every", type=int, default=13, help="print one line per this many weeks")
+    args = parser.parse_args()
+
+    sizes = team_sizes_from_csv(args.csv)
+    if args.members:
+        sizes = scale_team_sizes(sizes, args.members)
+    roster = synthetic_roster(sizes, random.Random(args.seed))
+    report = simulate(roster, args.weeks, seed=args.seed, rebuild=args.rebuild, trace_memory=not args.no_memory)
+
+    print(f"Seed {report.seed}: {report.members} members in {report.teams} teams, {args.weeks} weeks")
+    print(f"\n{'week':>10}  {'picks':>5}  {'ms':>8}  {'peak KiB':>9}")
+    for i, week in enumerate(report.weeks):
+        if i % max(1, args.every) == 0 or i == len(report.weeks) - 1:
+            print(f"{week.week.isoformat():>10}  {week.picks:>5}  {week.seconds * 1000:8.2f}  {week.peak_bytes / 1024:9.1f}")
+
+    latencies = sorted(w.seconds for w in report.weeks)
+    if latencies:
+        p50 = latencies[len(latencies) // 2] * 1000
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+        print(f"\nLatency: total {report.total_seconds:.3f}s, p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+    if not args.rebuild:
+        print(f"Initial queue build: {report.build_seconds * 1000:.2f} ms (not in the per-week figures)")
+    if not args.no_memory:
+        print(f"Peak memory per week: {report.peak_bytes / 1024:.1f} KiB")
+    print(f"Selected at least once: {report.selected_members}/{report.members}")
+    print(f"Longest wait for a selection: {report.max_gap_weeks} weeks (rotation bound {report.gap_bound_weeks})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+"""
+Shared Test Fixtures
+====================
+
+An autouse fixture that keeps Slack rate limits and the user directory out
+of the way. Shared fakes live in tests/fakes.py.
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from bot import slack
+from bot.directory import UserDirectory
+from bot.ratelimit import TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def fast_rate_limits(monkeypatch, tmp_path):
+    """Fast per-method buckets and a throwaway user directory."""
+    monkeypatch.setattr(slack, "_bucket_for", lambda method: TokenBucket(rate=60000))
+    monkeypatch.setattr(slack, "get_directory", lambda: UserDirectory(path=str(tmp_path / "d.db")))
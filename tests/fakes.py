@@ -0,0 +1,83 @@
+"""
+Test Fakes
+==========
+
+In-memory stand-ins for the Sheets and Slack APIs, and date helpers, shared
+by the test modules.
+"""
+
+from datetime import datetime, timedelta
+
+
+class FakeRequest:
+    """A request object whose execute() returns a canned result."""
+
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class FakeSheetsService:
+    """Records every values() call and serves reads from a fixed table."""
+
+    def __init__(self, values=None):
+        self.values_table = values or []
+        self.calls = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        self.calls.append(("get", kwargs))
+        return FakeRequest({"values": self.values_table})
+
+    def append(self, **kwargs):
+        self.calls.append(("append", kwargs))
+        return FakeRequest({})
+
+    def update(self, **kwargs):
+        self.calls.append(("update", kwargs))
+        return FakeRequest({})
+
+    def clear(self, **kwargs):
+        self.calls.append(("clear", kwargs))
+        return FakeRequest({})
+
+    def batchGet(self, **kwargs):
+        self.calls.append(("batchGet", kwargs))
+        return FakeRequest({"valueRanges": [{"values": v} for v in self.values_table]})
+
+    def batchUpdate(self, **kwargs):
+        self.calls.append(("batchUpdate", kwargs))
+        return FakeRequest({})
+
+    def count(self, method):
+        return sum(1 for name, _ in self.calls if name == method)
+
+
+class FakeDMClient:
+    """Resolves p{i}@northeastern.edu to U{i} and records every DM."""
+
+    def __init__(self, count):
+        self.members = [{"id": f"U{i}", "profile": {"email": f"p{i}@northeastern.edu"}} for i in range(count)]
+        self.posted = []
+
+    def users_list(self, cursor=None, limit=200):
+        return {"members": self.members, "response_metadata": {"next_cursor": ""}}
+
+    def chat_postMessage(self, channel, text, blocks=None):
+        self.posted.append(channel)
+        return {"ok": True, "channel": "D" + channel, "ts": "1.1"}
+
+
+def this_week_str():
+    return datetime.utcnow().date().strftime("%Y-%m-%d")
+
+
+def old_date_str():
+    return (datetime.utcnow().date() - timedelta(weeks=6)).strftime("%Y-%m-%d")
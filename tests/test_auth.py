@@ -0,0 +1,69 @@
+"""
+Token Cache Tests
+=================
+
+Tests for the cached service-account token provider in bot/auth.py.
+Credentials are replaced by a fake, so no key file or network is needed.
+"""
+
+import sys
+import os
+import stat
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.auth import TokenProvider
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+
+class FakeCredentials:
+    """Mints a new token, valid for an hour, on every refresh."""
+
+    minted = 0
+
+    def __init__(self):
+        self.service_account_email = "bot@project.iam.gserviceaccount.com"
+        self.token = None
+        self.expiry = None
+
+    def refresh(self, request):
+        FakeCredentials.minted += 1
+        self.token = f"token-{FakeCredentials.minted}"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+
+class _FakeProvider(TokenProvider):
+    def _load_credentials(self):
+        return FakeCredentials()
+
+
+class TestTokenProvider:
+    """Test caching and early refresh of the Sheets access token."""
+
+    def test_token_reused_across_processes(self, tmp_path):
+        """A fresh provider (a new invocation) reuses the cached token instead of minting."""
+        FakeCredentials.minted = 0
+        cache_path = str(tmp_path / "token.json")
+
+        first = _FakeProvider("credentials.json", SCOPES, cache_path=cache_path)
+        assert first.credentials().token == "token-1"
+        assert first.credentials().token == "token-1"
+        assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+        second = _FakeProvider("credentials.json", SCOPES, cache_path=cache_path)
+        assert second.credentials().token == "token-1"
+        assert FakeCredentials.minted == 1
+
+    def test_refreshes_ahead_of_expiry(self, tmp_path):
+        """A token inside the refresh margin is replaced before it is used."""
+        FakeCredentials.minted = 0
+        provider = _FakeProvider("credentials.json", SCOPES, cache_path=str(tmp_path / "t.json"),
+                                 refresh_margin=300)
+        creds = provider.credentials()
+        creds.expiry = datetime.utcnow() + timedelta(minutes=2)
+
+        assert provider.credentials().token == "token-2"
+        assert provider.refreshes == 2
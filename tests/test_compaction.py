@@ -0,0 +1,68 @@
+"""
+Compaction Tests
+================
+
+Tests for folding old Tracking rows into MemberHistory (bot/compaction.py).
+"""
+
+import sys
+import os
+from datetime import date
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.compaction import compact_tracking, plan_compaction, semester_tab
+from bot.sheets import MemberHistory, _parse_history
+from tests.fakes import FakeSheetsService, old_date_str, this_week_str
+
+CUTOFF = date(2025, 3, 3)
+ROWS = [
+    ["ann@northeastern.edu", "data", "2024-10-07", "TRUE", "0", "2024-10-08"],
+    ["bob@northeastern.edu", "data", "2024-10-07", "FALSE", "2", ""],
+    ["Ann@Northeastern.edu", "data", "2025-01-13", "FALSE", "2", ""],
+    ["cat@northeastern.edu", "data", "2025-03-10", "FALSE", "0", ""],
+    ["dan@northeastern.edu", "data", "not a date", "FALSE", "0", ""],
+]
+
+
+class TestCompaction:
+    """Test splitting Tracking into kept, archived and summarized rows."""
+
+    def test_old_rows_fold_into_history_and_archive(self):
+        """Rows before the cutoff go to their semester tab and the member summary."""
+        plan = plan_compaction(ROWS, {}, CUTOFF)
+
+        assert plan.keep == ROWS[3:]
+        assert sorted(plan.archive) == ["Archive_2024_Fall", "Archive_2025_Spring"]
+        ann = plan.history["ann@northeastern.edu"]
+        assert (ann.last_selected, ann.times_selected, ann.times_completed) == (date(2025, 1, 13), 2, 1)
+        assert ann.to_row() == ["ann@northeastern.edu", "2025-01-13", 2, 1, "0.50"]
+        assert semester_tab(date(2025, 6, 2)) == "Archive_2025_Summer"
+
+    def test_rerun_does_not_double_count(self):
+        """Re-running on rows already folded (a failed run left them in Tracking) changes nothing."""
+        first = plan_compaction(ROWS, {}, CUTOFF)
+        history = _parse_history([["Email"]] + [[str(c) for c in h.to_row()] for h in first.history.values()])
+
+        again = plan_compaction(ROWS, history, CUTOFF)
+
+        assert again.folded == 0
+        assert again.history["ann@northeastern.edu"] == MemberHistory("ann@northeastern.edu", date(2025, 1, 13), 2, 1)
+
+    def test_rewritten_rows_keep_message_ts_as_text(self):
+        """Kept and archived rows go back with G/H escaped, since the read lost their "'"."""
+        rows = [
+            ["old@northeastern.edu", "data", old_date_str(), "TRUE", "0", "", "D1", "1760000000.123456", ""],
+            ["new@northeastern.edu", "data", this_week_str(), "FALSE", "0", "", "D2", "1760700000.654321", ""],
+        ]
+        service = FakeSheetsService([[["Email"]] + rows, []])
+
+        compact_tracking(service, "sheet", cooldown_weeks=4)
+
+        writes = {kw["range"]: kw["body"]["values"] for name, kw in service.calls if name in ("append", "update")}
+        assert writes["Tracking!A2"] == [
+            ["new@northeastern.edu", "data", this_week_str(), "FALSE", "0", "", "'D2", "'1760700000.654321", ""]
+        ]
+        archive = next(values for rng, values in writes.items() if rng.startswith("Archive_"))
+        assert archive[1][6:8] == ["'D1", "'1760000000.123456"]
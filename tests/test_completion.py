@@ -0,0 +1,204 @@
+"""
+Completion Tests
+================
+
+Tests for detecting that someone finished the feedback form
+(bot/completion.py). Sheets and Slack are replaced by small fakes.
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import pipeline
+from bot.completion import (
+    CompletionTracker,
+    cancel_scheduled_reminders,
+    check_reaction_completions,
+    completion_key,
+    is_thumbs_up,
+    parse_completion_key,
+)
+from bot.messages import SUBMITTED_ACTION_ID, render_initial_blocks
+from bot.sheets import TrackingBatch, TrackingSnapshot, current_week_start
+from tests.fakes import FakeSheetsService, this_week_str
+
+
+class FakeReactionsClient:
+    """Serves reactions.get from a dict of (channel, ts) -> reaction names."""
+
+    def __init__(self, reactions):
+        self.reactions = reactions
+        self.calls = []
+
+    def reactions_get(self, channel, timestamp):
+        self.calls.append((channel, timestamp))
+        names = self.reactions.get((channel, timestamp), [])
+        return {"message": {"reactions": [{"name": n, "count": 1} for n in names]}}
+
+
+class TestReactionSweep:
+    """Test the reactions.get based completion check."""
+
+    def test_thumbs_up_variants(self):
+        """Skin-toned thumbs up counts; other emoji don't."""
+        assert is_thumbs_up("+1")
+        assert is_thumbs_up("+1::skin-tone-4")
+        assert not is_thumbs_up("eyes")
+
+    def test_one_call_per_pending_row(self):
+        """Only pending rows with a stored DM are checked, each with one call."""
+        week = this_week_str()
+        rows = [
+            ["a@northeastern.edu", "data", week, "FALSE", "0", "", "D1", "1.1"],
+            ["b@northeastern.edu", "data", week, "FALSE", "0", "", "D2", "2.2"],
+            ["c@northeastern.edu", "data", week, "TRUE", "0", week, "D3", "3.3"],
+            ["d@northeastern.edu", "data", week, "FALSE", "0"],
+        ]
+        snapshot = TrackingSnapshot(rows)
+        client = FakeReactionsClient({("D1", "1.1"): ["+1::skin-tone-2"], ("D2", "2.2"): ["eyes"]})
+        service = FakeSheetsService()
+
+        completed = check_reaction_completions(client, service, "sheet", snapshot)
+
+        assert completed == 1
+        assert client.calls == [("D1", "1.1"), ("D2", "2.2")]
+        assert service.count("batchUpdate") == 1
+        assert snapshot.row(2)[3] == "TRUE"
+
+
+class TestCompletionTracker:
+    """Test event-driven completion from reaction_added."""
+
+    def test_thumbs_up_on_tracked_dm_is_batched(self):
+        """Only 👍 on a tracked DM queues a write, and a flush writes the batch at once."""
+        week = this_week_str()
+        header = ["Email", "Team", "Date_Selected", "Form_Completed", "Reminders_Sent",
+                  "Date_Completed", "DM_Channel", "Message_TS"]
+        rows = [
+            ["a@northeastern.edu", "data", week, "FALSE", "0", "", "D1", "1.1"],
+            ["b@northeastern.edu", "data", week, "FALSE", "0", "", "D2", "2.2"],
+        ]
+        service = FakeSheetsService([header] + rows)
+        tracker = CompletionTracker(service, "sheet")
+        tracker.refresh(TrackingSnapshot([list(r) for r in rows]))
+
+        assert not tracker.handle_reaction("+1", "C_GENERAL", "9.9")
+        assert not tracker.handle_reaction("eyes", "D1", "1.1")
+        assert tracker.handle_reaction("+1", "D1", "1.1")
+        assert tracker.handle_reaction("thumbsup", "D2", "2.2")
+        # A second 👍 on the same DM is a no-op
+        assert not tracker.handle_reaction("+1", "D1", "1.1")
+        assert service.calls == []
+
+        assert tracker.flush() == 2
+        assert service.count("get") == 1
+        assert service.count("batchUpdate") == 1
+
+
+class TestSubmittedButton:
+    """Test the "Submitted" button on the initial DM."""
+
+    def test_button_carries_row_key(self):
+        """The button value round-trips to the Tracking row's email and week."""
+        key = completion_key("Ann@Northeastern.edu")
+        blocks = render_initial_blocks("Ann", "data", key)
+        button = blocks[-1]["elements"][0]
+
+        assert button["action_id"] == SUBMITTED_ACTION_ID
+        assert parse_completion_key(button["value"]) == ("ann@northeastern.edu", current_week_start())
+
+
+class FakeSchedulingClient:
+    """chat.postMessage / chat.scheduleMessage / chat.deleteScheduledMessage stand-in."""
+
+    def __init__(self):
+        self.scheduled = {}
+        self.deleted = []
+
+    def users_list(self, cursor=None, limit=200):
+        return {"members": [{"id": "U1", "profile": {"email": "a@northeastern.edu"}}],
+                "response_metadata": {"next_cursor": ""}}
+
+    def chat_postMessage(self, channel, text, blocks=None):
+        return {"ok": True, "channel": "D" + channel, "ts": "1.1"}
+
+    def chat_scheduleMessage(self, channel, text, post_at):
+        scheduled_id = f"Q{len(self.scheduled) + 1}"
+        self.scheduled[scheduled_id] = (channel, post_at)
+        return {"ok": True, "scheduled_message_id": scheduled_id}
+
+    def chat_deleteScheduledMessage(self, channel, scheduled_message_id):
+        self.deleted.append((channel, scheduled_message_id))
+        return {"ok": True}
+
+
+class TestScheduledReminders:
+    """Test reminders queued with chat.scheduleMessage at selection time."""
+
+    def test_scheduled_at_selection_and_cancelled_on_completion(self, monkeypatch):
+        """IDs land in Tracking, skip the cron reminder, and are deleted on 👍."""
+        monkeypatch.setattr(pipeline, "reminder_post_times", lambda: [2000000000, 2000100000])
+        client = FakeSchedulingClient()
+        service = FakeSheetsService()
+
+        sent = pipeline.send_selection_dms(
+            client, service, "sheet", [["Ann", "a@northeastern.edu", "data", "Active"]],
+            [("Ann", "a@northeastern.edu")], schedule_reminders=True,
+        )
+        row = service.calls[-1][1]["body"]["values"][0]
+        assert sent == 1
+        # The leading apostrophe keeps USER_ENTERED from turning the ts into a number
+        assert row[6:] == ["DU1", "'1.1", "Q1,Q2"]
+
+        snapshot = TrackingSnapshot([list(row)])
+        assert pipeline.send_reminder_dms(client, service, "sheet", snapshot, [("a@northeastern.edu", "data", 0)]) == 0
+
+        with TrackingBatch(service, "sheet", snapshot) as batch:
+            assert cancel_scheduled_reminders(client, snapshot, batch, "a@northeastern.edu") == 2
+        assert client.deleted == [("DU1", "Q1"), ("DU1", "Q2")]
+        assert snapshot.row(2)[8] == ""
+
+    def test_only_the_matching_reminder_slot_is_skipped(self, monkeypatch):
+        """A row whose first slot passed unscheduled still gets the first reminder from the cron run."""
+        monkeypatch.setattr(pipeline, "reminder_post_times", lambda: [None, 2000100000])
+        client = FakeSchedulingClient()
+        service = FakeSheetsService()
+
+        pipeline.send_selection_dms(
+            client, service, "sheet", [["Ann", "a@northeastern.edu", "data", "Active"]],
+            [("Ann", "a@northeastern.edu")], schedule_reminders=True,
+        )
+        row = service.calls[-1][1]["body"]["values"][0]
+        assert row[8] == ",Q1"
+
+        snapshot = TrackingSnapshot([list(row)])
+        pending = [("a@northeastern.edu", "data", 0)]
+        assert pipeline.send_reminder_dms(client, service, "sheet", snapshot, pending) == 1
+        assert pipeline.send_reminder_dms(client, service, "sheet", snapshot, [("a@northeastern.edu", "data", 1)]) == 0
+
+    def test_delivered_scheduled_reminder_counts_as_sent(self, monkeypatch):
+        """With "Q1," the first reminder is queued and the final failed; once Q1 is out the final is due."""
+        row = ["a@northeastern.edu", "data", this_week_str(), "FALSE", "0", "", "DU1", "1.1", "Q1,"]
+        client = FakeSchedulingClient()
+
+        # Before Wednesday's slot: the remind run leaves Q1 to Slack
+        monkeypatch.setattr(pipeline, "reminder_slot_times", lambda: [2000000000, 2000100000])
+        service = FakeSheetsService()
+        snapshot = TrackingSnapshot([list(row)])
+        pending = pipeline.pending_reminders(service, "sheet", snapshot)
+        assert pending == [("a@northeastern.edu", "data", 0)]
+        assert pipeline.send_reminder_dms(client, service, "sheet", snapshot, pending) == 0
+
+        # After it: Q1 counts as sent, E is updated, and the final run sends the final reminder
+        monkeypatch.setattr(pipeline, "reminder_slot_times", lambda: [100, 2000100000])
+        service = FakeSheetsService()
+        snapshot = TrackingSnapshot([list(row)])
+        pending = pipeline.pending_reminders(service, "sheet", snapshot)
+        assert pending == [("a@northeastern.edu", "data", 1)]
+        assert service.calls[-1][1]["body"]["data"] == [{"range": "Tracking!E2:E2", "values": [[1]]}]
+        final = [(email, team, count) for email, team, count in pending if count == 1]
+        assert pipeline.send_reminder_dms(client, service, "sheet", snapshot, final) == 1
+        assert snapshot.row(2)[4] == "2"
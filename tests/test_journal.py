@@ -0,0 +1,111 @@
+"""
+Run Journal Tests
+=================
+
+Tests for checkpointing and resuming runs (bot/journal.py and the
+journal/deadline handling in bot/pipeline.py).
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import pipeline
+from bot.journal import Deadline, RunJournal
+from bot.roster import Roster
+from bot.sheets import SheetData, TrackingSnapshot
+from tests.fakes import FakeDMClient, FakeSheetsService, this_week_str
+
+
+class FakeContext:
+    """Lambda context whose remaining time drops by `step_ms` on every check."""
+
+    def __init__(self, remaining_ms, step_ms):
+        self.remaining_ms = remaining_ms
+        self.step_ms = step_ms
+
+    def get_remaining_time_in_millis(self):
+        remaining = self.remaining_ms
+        self.remaining_ms -= self.step_ms
+        return remaining
+
+
+class TestRunJournal:
+    """Test the persisted (run_id, email, action) journal."""
+
+    def test_round_trip(self, tmp_path):
+        """Recorded steps and selections survive a reload; keys are case-insensitive."""
+        journal = RunJournal("select-2025-01-06", directory=str(tmp_path))
+        journal.remember_selections([("Ann", "ann@northeastern.edu")])
+        journal.record("Ann@Northeastern.edu", "dm")
+        journal.save()
+
+        reloaded = RunJournal("select-2025-01-06", directory=str(tmp_path))
+        assert reloaded.is_done("ann@northeastern.edu", "dm")
+        assert not reloaded.is_done("ann@northeastern.edu", "reminder1")
+        assert reloaded.selections == [("Ann", "ann@northeastern.edu")]
+        assert not reloaded.finished
+
+    def test_stops_at_deadline_and_resumes(self, tmp_path, monkeypatch):
+        """A run cut short by the deadline is finished by the next one with no duplicate DMs."""
+        monkeypatch.setattr(pipeline, "CHECKPOINT_CHUNK", 2)
+        roster = [[f"P{i}", f"p{i}@northeastern.edu", "data", "Active"] for i in range(5)]
+        selections = [(name, email) for name, email, _team, _status in roster]
+        client = FakeDMClient(5)
+        service = FakeSheetsService()
+
+        journal = RunJournal("select-test", directory=str(tmp_path))
+        # 20s left, then 5s: one chunk goes out before the 10s reserve is hit
+        deadline = Deadline(FakeContext(20000, 15000), reserve_sec=10)
+        assert pipeline.send_selection_dms(client, service, "sheet", roster, selections,
+                                           journal=journal, deadline=deadline) == 2
+        assert not journal.finished
+        assert service.count("append") == 1
+
+        resumed = RunJournal("select-test", directory=str(tmp_path))
+        sent = pipeline.send_selection_dms(client, service, "sheet", roster, selections,
+                                           journal=resumed, deadline=Deadline())
+        assert sent == 3
+        assert resumed.finished
+        assert sorted(client.posted) == [f"U{i}" for i in range(5)]
+
+    def test_dms_are_journaled_before_scheduling(self, tmp_path):
+        """Without time to pre-schedule, the chunk is still journaled and logged, then the run stops."""
+        roster = [[f"P{i}", f"p{i}@northeastern.edu", "data", "Active"] for i in range(7)]
+        selections = [(name, email) for name, email, _team, _status in roster]
+        client = FakeDMClient(7)
+        service = FakeSheetsService()
+        journal = RunJournal("select-test", directory=str(tmp_path))
+
+        # 15s left against a 10s reserve: enough to send a chunk, not to schedule 10 reminders
+        sent = pipeline.send_selection_dms(client, service, "sheet", roster, selections, schedule_reminders=True,
+                                           journal=journal, deadline=Deadline(FakeContext(15000, 0), reserve_sec=10))
+
+        assert sent == pipeline.SCHEDULED_CHUNK
+        assert not journal.finished
+        assert all(journal.is_done(f"p{i}@northeastern.edu", "dm") for i in range(pipeline.SCHEDULED_CHUNK))
+        rows = service.calls[-1][1]["body"]["values"]
+        assert [row[8] for row in rows] == [""] * pipeline.SCHEDULED_CHUNK
+
+    def test_plan_skips_people_already_logged(self):
+        """Without a journal, a team whose pick is already logged this week gets no more."""
+        data = SheetData(
+            roster=Roster.from_rows([["Ann", "ann@northeastern.edu", "data", "Active"],
+                                     ["Bo", "bo@northeastern.edu", "design", "Active"]]),
+            tracking=TrackingSnapshot([["ann@northeastern.edu", "data", this_week_str(), "FALSE", "0"]]),
+        )
+        assert pipeline.plan_selection(data) == [("Bo", "bo@northeastern.edu")]
+
+    def test_plan_resumes_a_partly_logged_team(self):
+        """Without a journal, a team with 1 of its 3 picks logged gets the other 2."""
+        members = [[f"P{i}", f"p{i}@northeastern.edu", "software", "Active"] for i in range(6)]
+        data = SheetData(
+            roster=Roster.from_rows(members),
+            tracking=TrackingSnapshot([["p0@northeastern.edu", "software", this_week_str(), "FALSE", "0"]]),
+        )
+        selections = pipeline.plan_selection(data)
+
+        assert len(selections) == 2
+        assert ("P0", "p0@northeastern.edu") not in selections
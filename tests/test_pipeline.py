@@ -0,0 +1,45 @@
+"""
+Pipeline Tests
+==============
+
+Tests for the selection fan-out in bot/pipeline.py.
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import pipeline
+from bot.journal import RunJournal
+from tests.fakes import FakeDMClient, FakeSheetsService
+
+
+class TestFanOut:
+    """Test sending each team's selections from its own worker."""
+
+    def test_one_worker_per_team(self, tmp_path, monkeypatch):
+        """Each team gets its own Sheets service and child journal; one users.list sweep is shared."""
+        services = []
+
+        def connect(_creds_path):
+            services.append(FakeSheetsService())
+            return services[-1]
+
+        monkeypatch.setattr(pipeline, "connect_to_sheets", connect)
+        teams = ["data", "software", "design"]
+        roster = [[f"P{i}", f"p{i}@northeastern.edu", teams[i % 3], "Active"] for i in range(9)]
+        selections = [(name, email) for name, email, _team, _status in roster]
+        client = FakeDMClient(9)
+        journal = RunJournal("select-fan", directory=str(tmp_path))
+
+        sent = pipeline.fan_out_selection_dms(
+            client, "creds.json", "sheet", roster, selections, team_workers=3, journal=journal
+        )
+
+        assert sent == 9
+        assert len(services) == 3
+        assert all(s.count("append") == 1 for s in services)
+        assert journal.finished
+        assert RunJournal("select-fan", directory=str(tmp_path)).child("design").is_done("p2@northeastern.edu", "dm")
@@ -0,0 +1,113 @@
+"""
+Selection Tests
+===============
+
+Tests for the roster model (bot/roster.py) and weekly selection
+(bot/selection.py).
+"""
+
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.roster import Member, Roster
+from bot.selection import TeamRotation, run_full_selection
+from bot.simulator import scale_team_sizes, simulate, synthetic_roster
+from bot.sheets import MemberHistory, SheetData, TrackingSnapshot
+
+ROWS = [
+    ["Ann", "Ann@Northeastern.edu", "data", "Active"],
+    ["Bo", "bo@northeastern.edu", "design", "Active"],
+    ["Cy", "cy@northeastern.edu", "data", "Active"],
+    ["Ann again", "ann@northeastern.edu", "software", "Active"],
+]
+
+
+class TestRoster:
+    """Test the indexed roster."""
+
+    def test_lookups_by_email_and_team(self):
+        """Emails are matched normalized, the first row wins, and teams keep roster order."""
+        roster = Roster.from_rows(ROWS)
+
+        assert roster.team_for(" ANN@northeastern.edu") == "data"
+        assert roster.team_for("nobody@northeastern.edu") == ""
+        assert roster.teams()["data"] == [("Ann", "Ann@Northeastern.edu"), ("Cy", "cy@northeastern.edu")]
+        assert Roster.of(roster) is roster
+        assert roster.rows() == ROWS
+
+    def test_partition(self):
+        """Selections group by roster team; people off the roster go under ""."""
+        roster = Roster.from_rows(ROWS)
+
+        partitions = roster.partition([("Bo", "bo@northeastern.edu"), ("Zed", "zed@northeastern.edu")])
+        assert partitions == {"design": [("Bo", "bo@northeastern.edu")], "": [("Zed", "zed@northeastern.edu")]}
+
+    def test_members_have_no_instance_dict(self):
+        """Members use __slots__, so large rosters don't carry a dict per row."""
+        assert not hasattr(Member("Ann", "ann@northeastern.edu", "data"), "__dict__")
+
+
+class TestRotation:
+    """Test least-recently-selected rotation per team."""
+
+    def test_everyone_is_picked_once_before_anyone_twice(self):
+        """Over a full cycle each member comes up exactly once, never-selected first."""
+        members = [(f"P{i}", f"p{i}@northeastern.edu") for i in range(7)]
+        last = {"p0@northeastern.edu": date(2025, 1, 6).toordinal()}
+        rotation = TeamRotation("design", members, last, random.Random(3))
+        monday = date(2025, 3, 3)
+
+        cycle = [rotation.pick(1, monday + timedelta(weeks=w))[0] for w in range(7)]
+
+        assert sorted(cycle) == sorted(members)
+        assert cycle[-1] == members[0]
+        assert rotation.pick(1, monday + timedelta(weeks=7)) == [cycle[0]]
+
+    def test_last_selected_merges_history_and_tracking(self):
+        """Compacted history and Tracking rows both push members back in the queue."""
+        roster = Roster.from_rows([[f"P{i}", f"p{i}@northeastern.edu", "design", "Active"] for i in range(3)])
+        data = SheetData(
+            roster=roster,
+            tracking=TrackingSnapshot([["p1@northeastern.edu", "design", "2025-02-24", "TRUE", "0"]]),
+            history={"p0@northeastern.edu": MemberHistory("p0@northeastern.edu", date(2024, 10, 7), 1, 1)},
+        )
+
+        assert data.last_selected() == {
+            "p0@northeastern.edu": date(2024, 10, 7).toordinal(),
+            "p1@northeastern.edu": date(2025, 2, 24).toordinal(),
+        }
+        assert run_full_selection(roster, data.last_selected()) == [("P2", "p2@northeastern.edu")]
+
+
+class TestSimulator:
+    """Test the seeded in-memory simulator."""
+
+    def test_same_seed_replays_and_gaps_stay_in_bound(self):
+        """A seed replays the same picks, and nobody waits longer than the rotation allows."""
+        sizes = scale_team_sizes({"data": 20, "design": 7, "ops": 2}, 300)
+        assert sum(sizes.values()) == 300
+
+        reports = [
+            simulate(synthetic_roster(sizes, random.Random(7)), 60, seed=7, start=date(2025, 1, 6), rebuild=rebuild)
+            for rebuild in (False, False, True)
+        ]
+
+        assert reports[0].selections == reports[1].selections
+        for report in (reports[0], reports[2]):
+            assert report.max_gap_weeks <= report.gap_bound_weeks
+            assert report.peak_bytes > 0
+            assert len(report.weeks) == 60
+        assert reports[0].build_seconds > 0
+
+    def test_members_never_picked_again_count_as_waiting(self):
+        """Open gaps at the end count: 7 members, 1 pick a week, 3 weeks leaves 4 waiting since the start."""
+        roster = synthetic_roster({"design": 7}, random.Random(1))
+        report = simulate(roster, 3, seed=1, start=date(2025, 1, 6), trace_memory=False)
+
+        assert report.selected_members == 3
+        assert report.max_gap_weeks == 3
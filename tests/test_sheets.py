@@ -0,0 +1,276 @@
+"""
+Sheets Tests
+============
+
+Tests for the Google Sheets helpers in bot/sheets.py.
+These use a small in-memory stand-in for the Sheets API so no network
+access or credentials are needed.
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from bot import sheets
+from bot.ratelimit import TokenBucket
+from bot.sheets import (
+    SelectionLogger,
+    TrackingBatch,
+    TrackingSnapshot,
+    get_pending_responses,
+    load_pending_snapshot,
+    load_sheet_data,
+    mark_completed,
+    update_reminder_count,
+)
+from tests.fakes import FakeRequest, FakeSheetsService, old_date_str, this_week_str
+
+
+class TestTrackingSnapshot:
+    """Test the indexed Tracking snapshot."""
+
+    def test_index_by_email_and_week(self):
+        """Rows are indexed by normalized email and week start."""
+        rows = [
+            ["old@northeastern.edu", "data", old_date_str(), "TRUE", "2", ""],
+            ["A@Northeastern.edu ", "data", this_week_str(), "FALSE", "0", ""],
+            ["bad-date@northeastern.edu", "data", "not a date", "FALSE", "0", ""],
+        ]
+        snapshot = TrackingSnapshot(rows)
+        week = datetime.utcnow().date() - timedelta(days=datetime.utcnow().date().weekday())
+
+        assert snapshot.find_row("a@northeastern.edu", week) == 3
+        assert snapshot.find_row("old@northeastern.edu", week) is None
+        assert snapshot.find_row("bad-date@northeastern.edu", week) is None
+
+    def test_updates_use_snapshot_without_rereading(self):
+        """Reminder and completion writes reuse the snapshot instead of reading again."""
+        header = ["Email", "Team", "Date_Selected", "Form_Completed", "Reminders_Sent", "Date_Completed"]
+        rows = [
+            ["a@northeastern.edu", "data", this_week_str(), "FALSE", "0", ""],
+            ["b@northeastern.edu", "data", this_week_str(), "FALSE", "1", ""],
+        ]
+        service = FakeSheetsService([header] + rows)
+        snapshot = TrackingSnapshot([list(r) for r in rows])
+
+        update_reminder_count(service, "sheet", "a@northeastern.edu", snapshot=snapshot)
+        update_reminder_count(service, "sheet", "a@northeastern.edu", snapshot=snapshot)
+        mark_completed(service, "sheet", "b@northeastern.edu", snapshot=snapshot)
+
+        assert service.count("get") == 0
+        assert service.count("batchUpdate") == 3
+        assert service.calls[1][1]["body"]["data"] == [{"range": "Tracking!E2:E2", "values": [[2]]}]
+
+        pending = get_pending_responses(service, "sheet", snapshot=snapshot)
+        assert pending == [("a@northeastern.edu", "data", 2)]
+
+
+class TestSelectionLogger:
+    """Test the buffered selection logger."""
+
+    def test_rows_are_appended_in_chunks(self):
+        """Selections are written in one append per chunk, not one per person."""
+        service = FakeSheetsService()
+        with SelectionLogger(service, "sheet", chunk_size=2) as tracking_log:
+            for i in range(5):
+                tracking_log.add(f"p{i}@northeastern.edu", f"Person {i}", "data")
+
+        assert service.count("append") == 3
+        assert tracking_log.logged == 5
+        assert len(service.calls[0][1]["body"]["values"]) == 2
+
+    def test_flushes_when_loop_fails(self):
+        """Rows buffered before an error are still written."""
+        service = FakeSheetsService()
+        try:
+            with SelectionLogger(service, "sheet") as tracking_log:
+                tracking_log.add("a@northeastern.edu", "A", "data")
+                raise RuntimeError("slack went away")
+        except RuntimeError:
+            pass
+
+        assert service.count("append") == 1
+        assert tracking_log.buffer == []
+
+
+class TestLoadSheetData:
+    """Test the combined Roster/Tracking/Config loader."""
+
+    def test_single_batch_get(self):
+        """Roster, Tracking and Config are parsed from one batchGet; Config overrides BotConfig."""
+        service = FakeSheetsService([
+            [["Name", "Email", "Team", "Status"],
+             ["Ann", "ann@northeastern.edu", "Data", "Active"],
+             ["Bob", "bob@northeastern.edu", "data", "Inactive"]],
+            [["Email", "Team", "Date_Selected"],
+             ["bob@northeastern.edu", "data", this_week_str(), "FALSE", "0"]],
+            [["Key", "Value"], ["cooldown_weeks", "6"], ["team_count.Design", "2"], ["team_count.data", "x"]],
+        ])
+        data = load_sheet_data(service, "sheet")
+
+        assert [c[0] for c in service.calls] == ["batchGet"]
+        assert data.roster.rows() == [["Ann", "ann@northeastern.edu", "data", "Active"]]
+        assert data.last_selected() == {"bob@northeastern.edu": datetime.utcnow().date().toordinal()}
+        # Known keys are applied with their types; a bad value leaves the default
+        assert data.config.cooldown_weeks == 6
+        assert data.config.team_counts == {"software": 3, "data": 3, "default": 1, "design": 2}
+
+
+class TestTrackingBatch:
+    """Test batching reminder and completion writes."""
+
+    def test_whole_pass_is_one_batch_update(self):
+        """A reminder pass over many people makes a single write."""
+        rows = [[f"p{i}@northeastern.edu", "data", this_week_str(), "FALSE", "0", ""] for i in range(10)]
+        service = FakeSheetsService()
+        snapshot = TrackingSnapshot(rows)
+
+        with TrackingBatch(service, "sheet", snapshot) as batch:
+            for i in range(10):
+                assert batch.increment_reminder(f"p{i}@northeastern.edu")
+            batch.mark_completed("p0@northeastern.edu")
+            assert not batch.increment_reminder("nobody@northeastern.edu")
+
+        assert service.count("batchUpdate") == 1
+        data = service.calls[0][1]["body"]["data"]
+        assert len(data) == 12
+        assert snapshot.row(2)[3] == "TRUE"
+
+    def test_checkpoints(self):
+        """Large passes commit every checkpoint_every rows."""
+        rows = [[f"p{i}@northeastern.edu", "data", this_week_str(), "FALSE", "0", ""] for i in range(5)]
+        service = FakeSheetsService()
+        with TrackingBatch(service, "sheet", TrackingSnapshot(rows), checkpoint_every=2) as batch:
+            for i in range(5):
+                batch.increment_reminder(f"p{i}@northeastern.edu")
+
+        assert service.count("batchUpdate") == 3
+        assert batch.committed == 5
+
+
+class FakeAppendingService(FakeSheetsService):
+    """Answers appends with the rows written, as the Sheets API does."""
+
+    def __init__(self, values=None, next_row=120):
+        super().__init__(values)
+        self.next_row = next_row
+
+    def append(self, **kwargs):
+        self.calls.append(("append", kwargs))
+        first, count = self.next_row, len(kwargs["body"]["values"])
+        self.next_row += count
+        return FakeRequest({"updates": {"updatedRange": f"Tracking!A{first}:I{first + count - 1}"}})
+
+
+class TestPendingView:
+    """Test the Pending tab that reminder runs read instead of Tracking."""
+
+    def test_logged_rows_are_mirrored_with_tracking_refs(self):
+        """Each Tracking append adds Pending rows whose mutable cells point at those Tracking rows."""
+        service = FakeAppendingService()
+        with SelectionLogger(service, "sheet") as tracking_log:
+            tracking_log.add("a@northeastern.edu", "A", "data", "D1", "1700000000.000100")
+            tracking_log.add("b@northeastern.edu", "B", "data")
+
+        assert [c[1]["range"] for c in service.calls] == ["Tracking!A:I", "Pending!A:J"]
+        pending = service.calls[1][1]["body"]["values"]
+        assert pending[0][3:6] == ["=Tracking!D120", "=Tracking!E120", "=Tracking!F120"]
+        assert pending[0][7] == "'1700000000.000100"
+        assert [row[9] for row in pending] == [120, 121]
+
+    def test_reminders_write_back_to_tracking_rows(self):
+        """Only this week's Pending rows load, and writes go to their Tracking rows."""
+        week = this_week_str()
+        service = FakeSheetsService([
+            ["Email", "Team", "Date_Selected", "Form_Completed", "Reminders_Sent",
+             "Date_Completed", "DM_Channel", "Message_TS", "Scheduled_Reminders", "Tracking_Row"],
+            ["old@northeastern.edu", "data", old_date_str(), "FALSE", "2", "", "", "", "", "40"],
+            ["a@northeastern.edu", "data", week, "FALSE", "0", "", "D1", "1.1", "", "120"],
+            ["b@northeastern.edu", "data", week, "TRUE", "1", week, "D2", "2.2", "", "121"],
+        ])
+        snapshot = load_pending_snapshot(service, "sheet")
+
+        assert get_pending_responses(service, "sheet", snapshot) == [("a@northeastern.edu", "data", 0)]
+        with TrackingBatch(service, "sheet", snapshot) as batch:
+            assert batch.increment_reminder("a@northeastern.edu")
+        assert service.calls[-1][1]["body"]["data"] == [{"range": "Tracking!E120:E120", "values": [[1]]}]
+        assert load_pending_snapshot(FakeSheetsService([]), "sheet") is None
+
+
+def _http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"{}")
+
+
+class _FlakyRequest:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.attempts = 0
+
+    def execute(self):
+        self.attempts += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"ok": True}
+
+
+class TestRetry:
+    """Test the quota-aware retry wrapper."""
+
+    def test_retries_rate_limit_then_succeeds(self, monkeypatch):
+        """429s and 5xx are retried with backoff."""
+        monkeypatch.setattr(sheets.time, "sleep", lambda _s: None)
+        monkeypatch.setattr(sheets, "_read_bucket", TokenBucket(rate=6000))
+        request = _FlakyRequest([_http_error(429), _http_error(503)])
+        assert sheets._retry_call(lambda: request, retries=5) == {"ok": True}
+        assert request.attempts == 3
+
+    def test_bad_request_is_not_retried(self, monkeypatch):
+        """A 400 fails on the first attempt."""
+        monkeypatch.setattr(sheets.time, "sleep", lambda _s: None)
+        request = _FlakyRequest([_http_error(400)])
+        with pytest.raises(HttpError):
+            sheets._retry_call(lambda: request, retries=5)
+        assert request.attempts == 1
+
+    def test_token_bucket_limits_burst(self):
+        """The bucket hands out its capacity, then makes callers wait."""
+        bucket = TokenBucket(rate=600, per=60.0, capacity=2)
+        assert bucket.acquire() == 0.0
+        assert bucket.acquire() == 0.0
+        assert bucket.acquire() > 0.0
+
+
+class TestDiscovery:
+    """Test building the Sheets service from the offline discovery document."""
+
+    def test_document_parsed_once_and_used_offline(self, monkeypatch):
+        """The bundled document is parsed once and build() never fetches it."""
+        from google.auth.credentials import AnonymousCredentials
+        from googleapiclient import discovery
+
+        class _Provider:
+            def credentials(self):
+                return AnonymousCredentials()
+
+        monkeypatch.setattr(sheets, "_discovery_document", None)
+        monkeypatch.setattr(sheets, "get_token_provider", lambda path, scopes: _Provider())
+
+        def no_fetch(*args, **kwargs):
+            raise AssertionError("discovery document fetched")
+
+        monkeypatch.setattr(discovery, "build", no_fetch)
+
+        service = sheets.connect_to_sheets("credentials.json")
+        document = sheets._sheets_discovery_document()
+        assert sheets.connect_to_sheets("credentials.json") is not service
+        assert sheets._sheets_discovery_document() is document
+
+        request = service.spreadsheets().values().get(spreadsheetId="sheet", range="Tracking!A:I")
+        assert "/v4/spreadsheets/sheet/values/" in request.uri
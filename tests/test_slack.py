@@ -0,0 +1,168 @@
+"""
+Slack Tests
+===========
+
+Tests for the Slack helpers in bot/slack.py and bot/directory.py.
+A fake WebClient records calls so nothing is sent to Slack.
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
+from bot import slack
+from bot.directory import UserDirectory, canonical_email, email_variants
+from bot.slack import batch_lookup_users, get_slack_client, lookup_user_by_email, send_many
+
+
+def _slack_error(error, status=200, headers=None):
+    response = SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/test",
+        req_args={},
+        data={"ok": False, "error": error},
+        headers=headers or {},
+        status_code=status,
+    )
+    return SlackApiError(error, response)
+
+
+class FakeSlackClient:
+    """Answers users.list and users.lookupByEmail from a dict of email -> user ID."""
+
+    def __init__(self, users=None):
+        self.users = users or {}
+        self.calls = []
+
+    def users_list(self, cursor=None, limit=200):
+        self.calls.append(("users.list", cursor))
+        members = [{"id": uid, "profile": {"email": email}} for email, uid in self.users.items()]
+        start = int(cursor or 0)
+        page = members[start:start + limit]
+        next_cursor = str(start + limit) if start + limit < len(members) else ""
+        return {"members": page, "response_metadata": {"next_cursor": next_cursor}}
+
+    def users_lookupByEmail(self, email):
+        self.calls.append(("users.lookupByEmail", email))
+        user_id = self.users.get(email)
+        if user_id is None:
+            raise _slack_error("users_not_found")
+        return {"user": {"id": user_id}}
+
+
+class TestUserDirectory:
+    """Test the persistent email -> user ID directory."""
+
+    def test_aliases_share_one_entry(self):
+        """husky.neu.edu and northeastern.edu resolve to the same key."""
+        assert canonical_email(" Kwan.Che@husky.neu.edu") == "kwan.che@northeastern.edu"
+        assert email_variants("kwan.che@northeastern.edu") == [
+            "kwan.che@northeastern.edu",
+            "kwan.che@husky.neu.edu",
+        ]
+
+    def test_lookup_hits_api_once_then_disk(self, tmp_path):
+        """A resolved user is served from the cache, including after a restart."""
+        path = str(tmp_path / "directory.db")
+        client = FakeSlackClient({"kwan.che@husky.neu.edu": "U123"})
+
+        directory = UserDirectory(path=path)
+        assert lookup_user_by_email(client, "kwan.che@northeastern.edu", directory) == "U123"
+        assert lookup_user_by_email(client, "kwan.che@northeastern.edu", directory) == "U123"
+        assert len(client.calls) == 2  # northeastern miss, husky hit
+
+        reloaded = UserDirectory(path=path)
+        assert reloaded.get("kwan.che@husky.neu.edu") == "U123"
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Entries older than the TTL are looked up again."""
+        directory = UserDirectory(path=str(tmp_path / "directory.db"), ttl_seconds=-1)
+        directory.put("a@northeastern.edu", "U1")
+        assert directory.get("a@northeastern.edu") is None
+
+
+class TestBatchLookup:
+    """Test resolving many emails with one users.list sweep."""
+
+    def test_stops_once_everyone_is_found(self, tmp_path):
+        """The sweep ends on the page where the last wanted email appears."""
+        users = {f"p{i}@northeastern.edu": f"U{i}" for i in range(1000)}
+        users["kwan.che@husky.neu.edu"] = "UKWAN"
+        client = FakeSlackClient(users)
+        directory = UserDirectory(path=str(tmp_path / "directory.db"))
+
+        result = batch_lookup_users(client, ["p3@northeastern.edu", "p250@northeastern.edu"], directory)
+        assert result == {"p3@northeastern.edu": "U3", "p250@northeastern.edu": "U250"}
+        assert [c[0] for c in client.calls] == ["users.list", "users.list"]
+
+        # Alias matching while streaming, and cached members need no call at all
+        client.calls = []
+        result = batch_lookup_users(client, ["kwan.che@northeastern.edu", "p3@northeastern.edu"], directory)
+        assert result["kwan.che@northeastern.edu"] == "UKWAN"
+        assert result["p3@northeastern.edu"] == "U3"
+        assert all(c[0] == "users.list" for c in client.calls)
+
+
+class FakePostClient:
+    """chat.postMessage stand-in that rate-limits the first call for one user."""
+
+    def __init__(self, limited_user=None):
+        self.limited_user = limited_user
+        self.posted = []
+
+    def chat_postMessage(self, channel, text, blocks=None):
+        if channel == self.limited_user:
+            self.limited_user = None
+            raise _slack_error("ratelimited", status=429, headers={"Retry-After": "2"})
+        if channel == "UGONE":
+            raise _slack_error("user_not_found")
+        self.posted.append(channel)
+        return {"ok": True, "channel": "D" + channel, "ts": "1700000000.000100"}
+
+
+class TestSendMany:
+    """Test concurrent DM sending."""
+
+    def test_results_in_order_with_retry_after(self, monkeypatch):
+        """429s wait for Retry-After and retry; failures are reported per recipient."""
+        sleeps = []
+        monkeypatch.setattr(slack.time, "sleep", sleeps.append)
+        client = FakePostClient(limited_user="U2")
+
+        results = send_many(client, [("U1", "hi"), ("U2", "hi"), ("UGONE", "hi")], workers=3)
+
+        assert [r.user_id for r in results] == ["U1", "U2", "UGONE"]
+        assert [r.ok for r in results] == [True, True, False]
+        assert results[1].channel == "DU2"
+        assert results[2].error == "user_not_found"
+        assert 2.0 in sleeps
+
+    def test_dead_accounts_are_forgotten(self):
+        """A user_not_found DM drops the cached ID; other failures keep it."""
+        slack.get_directory().put_many({"gone@northeastern.edu": "UGONE", "busy@northeastern.edu": "U2"})
+        results = send_many(FakePostClient(), [("UGONE", "hi")])
+
+        assert slack.forget_stale_user("gone@northeastern.edu", results[0])
+        assert not slack.forget_stale_user("busy@northeastern.edu", slack.DMResult("U2", ok=False, error="fatal_error"))
+        assert slack.get_directory().get("gone@northeastern.edu") is None
+        assert slack.get_directory().get("busy@northeastern.edu") == "U2"
+
+
+class TestSlackClient:
+    """Test the process-wide client factory."""
+
+    def test_client_is_reused_until_token_changes(self, monkeypatch):
+        """Repeated calls share one client and a verifying SSL context."""
+        monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-first")
+        client = get_slack_client()
+        assert get_slack_client() is client
+        assert client.ssl.check_hostname is True
+
+        monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-second")
+        assert get_slack_client() is not client
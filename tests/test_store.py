@@ -0,0 +1,112 @@
+"""
+Sheet Store Tests
+=================
+
+Tests for the local SQLite mirror in bot/store.py. A small fake serves
+batchGet ranges out of in-memory Roster/Tracking tabs.
+"""
+
+import sys
+import os
+import re
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.sheets import TrackingSnapshot, get_pending_responses
+from bot.store import SheetStore
+from tests.fakes import FakeRequest, old_date_str, this_week_str
+
+HEADER = ["Email", "Team", "Date_Selected", "Form_Completed", "Reminders_Sent", "Date_Completed"]
+
+
+class FakeSheetBook:
+    """Answers values.batchGet for Roster, Tracking and Config ranges."""
+
+    def __init__(self, tracking):
+        self.tabs = {
+            "Roster": [["Name", "Email", "Team", "Status"], ["Ann", "ann@northeastern.edu", "Data", "Active"]],
+            "Tracking": [HEADER] + tracking,
+            "Config": [["Key", "Value"], ["cooldown_weeks", "4"]],
+            "MemberHistory": [["Email", "Last_Selected", "Times_Selected", "Times_Completed", "Completion_Rate"]],
+        }
+        self.ranges = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def _read(self, rng):
+        tab, cells = rng.split("!")
+        rows = self.tabs[tab]
+        match = re.match(r"A(\d+)?:[A-Z](\d+)?$", cells)
+        first = int(match.group(1) or 1)
+        last = int(match.group(2) or len(rows))
+        return [list(r) for r in rows[first - 1:last]]
+
+    def batchGet(self, spreadsheetId, ranges):
+        self.ranges.append(list(ranges))
+        return FakeRequest({"valueRanges": [{"values": self._read(r)} for r in ranges]})
+
+
+def _rows(count, date_str):
+    return [[f"p{i}@northeastern.edu", "data", date_str, "FALSE", "0", ""] for i in range(count)]
+
+
+class TestSheetStore:
+    """Test incremental sync and local queries."""
+
+    def test_incremental_sync_reads_only_recent_rows(self, tmp_path):
+        """After the first sync only this window of Tracking is fetched again."""
+        book = FakeSheetBook(_rows(50, old_date_str()) + _rows(3, this_week_str()))
+        store = SheetStore(path=str(tmp_path / "store.db"))
+
+        assert store.sync(book, "sheet") == 53
+        assert book.ranges[0] == ["Tracking!A2:I", "Roster!A:D", "Config!A:B", "MemberHistory!A:E"]
+
+        # A completion on this week's rows and a new selection, both after the last sync
+        book.tabs["Tracking"][52][3] = "TRUE"
+        book.tabs["Tracking"].append(["new@northeastern.edu", "data", this_week_str(), "FALSE", "0", ""])
+
+        assert store.sync(book, "sheet") == 4
+        assert book.ranges[1] == ["Tracking!A52:I", "Tracking!A51:I51"]
+
+        full = TrackingSnapshot(book.tabs["Tracking"][1:])
+        expected = get_pending_responses(None, "sheet", snapshot=full)
+        week = store.week_snapshot()
+        assert get_pending_responses(None, "sheet", snapshot=week) == expected
+        assert len(expected) == 3
+        assert sorted(week.by_row) == [52, 53, 54, 55]
+
+        data = store.sheet_data()
+        assert data.roster.rows() == [["Ann", "ann@northeastern.edu", "data", "Active"]]
+        assert data.last_selected() == full.table.last_selected()
+
+    def test_rows_removed_above_window_trigger_full_reload(self, tmp_path):
+        """If the row above the window changed, the whole tab is reloaded."""
+        book = FakeSheetBook(_rows(5, old_date_str()) + _rows(2, this_week_str()))
+        store = SheetStore(path=str(tmp_path / "store.db"))
+        store.sync(book, "sheet")
+
+        del book.tabs["Tracking"][2]
+        store.sync(book, "sheet")
+
+        assert book.ranges[-1][0] == "Tracking!A2:I"
+        # This week's rows moved up one sheet row with the deletion
+        assert sorted(store.week_snapshot().by_row) == [6, 7]
+
+    def test_full_reload_refreshes_member_history(self, tmp_path):
+        """Compaction folds rows into MemberHistory; the reload picks that up before the roster TTL."""
+        book = FakeSheetBook(_rows(5, old_date_str()) + _rows(2, this_week_str()))
+        store = SheetStore(path=str(tmp_path / "store.db"))
+        store.sync(book, "sheet")
+
+        # What compaction leaves behind: old rows gone from Tracking, summarized in MemberHistory
+        del book.tabs["Tracking"][1:6]
+        book.tabs["MemberHistory"] += [[f"p{i}@northeastern.edu", old_date_str(), "1", "0", "0%"] for i in range(5)]
+        store.sync(book, "sheet")
+
+        assert book.ranges[-1][-3:] == ["Roster!A:D", "Config!A:B", "MemberHistory!A:E"]
+        assert store.sheet_data().last_selected()["p4@northeastern.edu"] > 0
@@ -0,0 +1,57 @@
+"""
+Tracking Table Tests
+====================
+
+Tests for the columnar Tracking decoder (bot/tracking_table.py).
+"""
+
+import sys
+import os
+from datetime import date
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.tracking_table import TrackingTable, date_ordinal, week_ordinal
+
+ROWS = [
+    [" Ann@Northeastern.edu", "Data", "2025-03-05", "TRUE", "1", "2025-03-06"],
+    ["bob@northeastern.edu", "data", "2025-03-05", "FALSE", "0"],
+    ["ann@northeastern.edu", "Data", "2025-03-07", "FALSE", "2"],
+    ["cat@northeastern.edu", "design", "not a date", "FALSE", "0"],
+    ["dan@northeastern.edu", "design"],
+]
+
+
+class TestTrackingTable:
+    """Test decoding Tracking rows into typed columns."""
+
+    def test_columns_are_typed_and_encoded(self):
+        """Emails and teams share codes once normalized; dates are ordinals, 0 when unparseable."""
+        table = TrackingTable(ROWS)
+
+        assert list(table.email_ids) == [0, 1, 0, 2, 3]
+        assert table.teams == ["data", "design"]
+        assert table.selected[0] == date(2025, 3, 5).toordinal()
+        assert list(table.selected[3:]) == [0, 0]
+        assert list(table.completed) == [1, 0, 0, 0, 0]
+        assert list(table.reminders) == [1, 0, 2, 0, 0]
+        assert list(table.widths) == [6, 5, 5, 5, 2]
+
+    def test_week_filters(self):
+        """Week filters compare whole columns; the first row per email wins."""
+        table = TrackingTable(ROWS)
+        monday = date(2025, 3, 3)
+
+        assert week_ordinal(date(2025, 3, 9).toordinal()) == monday.toordinal()
+        assert table.in_week(monday) == [0, 1, 2]
+        assert table.week_rows(monday) == {"ann@northeastern.edu": 2, "bob@northeastern.edu": 3}
+        assert table.team_counts_in_week(monday) == {"data": 2}
+
+    def test_each_date_string_is_parsed_once(self):
+        """Repeated dates are served from the parse cache."""
+        date_ordinal.cache_clear()
+        TrackingTable([["a@northeastern.edu", "data", "2025-03-05"]] * 50)
+        TrackingTable([["b@northeastern.edu", "data", "2025-03-05"]])
+
+        assert date_ordinal.cache_info().misses == 1